@@ -0,0 +1,225 @@
+"""partition_orders_by_month
+
+Revision ID: 5c8e2f7a9d31
+Revises: b6e1f3a8c472
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from datetime import date, datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e2f7a9d31'
+down_revision: Union[str, Sequence[str], None] = 'b6e1f3a8c472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# orders, order_items and order_item_options become RANGE partitioned by month
+# on the order's created_at (copied to the child tables as order_created_at).
+# The old tables are renamed, the partitioned ones created under the original
+# names, the rows copied across and the old tables dropped.
+# Later months are created by app/db/partitions.py:ensure_partitions.
+TABLES = ['orders', 'order_items', 'order_item_options']
+MONTHS_AHEAD = 3
+
+
+def _add_months(d: date, months: int) -> date:
+    m = d.year * 12 + d.month - 1 + months
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def _create_partitioned_tables() -> None:
+    op.create_table('orders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('table_number', sa.String(length=10), nullable=True),
+    sa.Column('total_price', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('order_type', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('store_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_orders_store_status_created', 'orders', ['store_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False)
+    op.create_index('ix_orders_store_created_id', 'orders', ['store_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orders_pending', 'orders', ['store_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+
+    op.create_table('order_items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('order_created_at', sa.DateTime(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('unit_price', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id', 'order_created_at'], ['orders.id', 'orders.created_at'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    postgresql_partition_by='RANGE (order_created_at)'
+    )
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id', 'order_created_at'], unique=False)
+
+    op.create_table('order_item_options',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_item_id', sa.UUID(), nullable=False),
+    sa.Column('order_created_at', sa.DateTime(), nullable=False),
+    sa.Column('option_name', sa.String(length=50), nullable=False),
+    sa.Column('price_delta', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['order_item_id', 'order_created_at'], ['order_items.id', 'order_items.order_created_at'], ),
+    sa.PrimaryKeyConstraint('id', 'order_created_at'),
+    postgresql_partition_by='RANGE (order_created_at)'
+    )
+    op.create_index('ix_order_item_options_order_item_id', 'order_item_options',
+                    ['order_item_id', 'order_created_at'], unique=False)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('order_idempotency_keys_order_id_fkey', 'order_idempotency_keys', type_='foreignkey')
+    op.drop_constraint('order_item_options_order_item_id_fkey', 'order_item_options', type_='foreignkey')
+    op.drop_constraint('order_items_order_id_fkey', 'order_items', type_='foreignkey')
+    op.drop_index('ix_order_idempotency_keys_order_id', table_name='order_idempotency_keys')
+    op.drop_index('ix_order_item_options_order_item_id', table_name='order_item_options')
+    op.drop_index('ix_order_items_order_id', table_name='order_items')
+    op.drop_index('ix_orders_pending', table_name='orders')
+    op.drop_index('ix_orders_store_created_id', table_name='orders')
+    op.drop_index('ix_orders_created_at', table_name='orders')
+    op.drop_index('ix_orders_store_status_created', table_name='orders')
+    for table in TABLES:
+        op.drop_constraint(f'{table}_pkey', table, type_='primary')
+        op.rename_table(table, f'{table}_unpartitioned')
+
+    _create_partitioned_tables()
+
+    # One partition per month from the oldest order through MONTHS_AHEAD months
+    # from now, plus a default partition for anything outside those bounds
+    conn = op.get_bind()
+    oldest = conn.execute(sa.text('SELECT min(created_at) FROM orders_unpartitioned')).scalar()
+    current = (datetime.utcnow() + timedelta(hours=8)).date().replace(day=1)
+    month = min(oldest.date().replace(day=1), current) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        for table in TABLES:
+            op.execute(f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                       f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')")
+        month = _add_months(month, 1)
+    for table in TABLES:
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute("""
+        INSERT INTO orders (id, table_number, total_price, status, order_type, created_at, store_id)
+        SELECT id, table_number, total_price, status, order_type, created_at, store_id
+        FROM orders_unpartitioned
+    """)
+    op.execute("""
+        INSERT INTO order_items (id, order_id, order_created_at, product_id, product_name, quantity, unit_price)
+        SELECT oi.id, oi.order_id, o.created_at, oi.product_id, oi.product_name, oi.quantity, oi.unit_price
+        FROM order_items_unpartitioned oi
+        JOIN orders_unpartitioned o ON o.id = oi.order_id
+    """)
+    op.execute("""
+        INSERT INTO order_item_options (id, order_item_id, order_created_at, option_name, price_delta)
+        SELECT oio.id, oio.order_item_id, o.created_at, oio.option_name, oio.price_delta
+        FROM order_item_options_unpartitioned oio
+        JOIN order_items_unpartitioned oi ON oi.id = oio.order_item_id
+        JOIN orders_unpartitioned o ON o.id = oi.order_id
+    """)
+
+    op.add_column('order_idempotency_keys', sa.Column('order_created_at', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE order_idempotency_keys k SET order_created_at = o.created_at
+        FROM orders_unpartitioned o WHERE o.id = k.order_id
+    """)
+    op.execute('DELETE FROM order_idempotency_keys WHERE order_created_at IS NULL')
+    op.alter_column('order_idempotency_keys', 'order_created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_order_idempotency_keys_order_id', 'order_idempotency_keys',
+                    ['order_id', 'order_created_at'], unique=False)
+    op.create_foreign_key('order_idempotency_keys_order_id_fkey', 'order_idempotency_keys', 'orders',
+                          ['order_id', 'order_created_at'], ['id', 'created_at'], ondelete='CASCADE')
+
+    for table in reversed(TABLES):
+        op.drop_table(f'{table}_unpartitioned')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('order_idempotency_keys_order_id_fkey', 'order_idempotency_keys', type_='foreignkey')
+    op.drop_index('ix_order_idempotency_keys_order_id', table_name='order_idempotency_keys')
+    for table in TABLES:
+        op.rename_table(table, f'{table}_partitioned')
+    # Index names are global; free them for the plain tables
+    for index in ['ix_orders_store_status_created', 'ix_orders_created_at', 'ix_orders_store_created_id',
+                  'ix_orders_pending', 'ix_order_items_order_id', 'ix_order_item_options_order_item_id']:
+        op.execute(f'DROP INDEX {index}')
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table}_partitioned RENAME CONSTRAINT {table}_pkey TO {table}_partitioned_pkey')
+
+    op.create_table('orders',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('table_number', sa.String(length=10), nullable=True),
+    sa.Column('total_price', sa.BigInteger(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('order_type', sa.String(length=20), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('store_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_orders_store_status_created', 'orders', ['store_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False)
+    op.create_index('ix_orders_store_created_id', 'orders', ['store_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_orders_pending', 'orders', ['store_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+    op.create_table('order_items',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=True),
+    sa.Column('unit_price', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_items_order_id', 'order_items', ['order_id'], unique=False)
+    op.create_table('order_item_options',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('order_item_id', sa.UUID(), nullable=False),
+    sa.Column('option_name', sa.String(length=50), nullable=False),
+    sa.Column('price_delta', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['order_item_id'], ['order_items.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_order_item_options_order_item_id', 'order_item_options', ['order_item_id'], unique=False)
+
+    op.execute("""
+        INSERT INTO orders (id, table_number, total_price, status, order_type, created_at, store_id)
+        SELECT id, table_number, total_price, status, order_type, created_at, store_id
+        FROM orders_partitioned
+    """)
+    op.execute("""
+        INSERT INTO order_items (id, order_id, product_id, product_name, quantity, unit_price)
+        SELECT id, order_id, product_id, product_name, quantity, unit_price
+        FROM order_items_partitioned
+    """)
+    op.execute("""
+        INSERT INTO order_item_options (id, order_item_id, option_name, price_delta)
+        SELECT id, order_item_id, option_name, price_delta
+        FROM order_item_options_partitioned
+    """)
+
+    op.drop_column('order_idempotency_keys', 'order_created_at')
+    op.create_index('ix_order_idempotency_keys_order_id', 'order_idempotency_keys', ['order_id'], unique=False)
+    op.create_foreign_key('order_idempotency_keys_order_id_fkey', 'order_idempotency_keys', 'orders',
+                          ['order_id'], ['id'], ondelete='CASCADE')
+
+    # Dropping the parents drops their partitions
+    for table in reversed(TABLES):
+        op.drop_table(f'{table}_partitioned')
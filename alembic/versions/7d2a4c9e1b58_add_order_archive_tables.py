@@ -0,0 +1,47 @@
+"""add_order_archive_tables
+
+Revision ID: 7d2a4c9e1b58
+Revises: 5c8e2f7a9d31
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2a4c9e1b58'
+down_revision: Union[str, Sequence[str], None] = '5c8e2f7a9d31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('order_archives',
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('path', sa.String(length=500), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('item_count', sa.Integer(), nullable=False),
+    sa.Column('option_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.BigInteger(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('month')
+    )
+    op.create_table('archived_daily_sales',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('store_id', 'day')
+    )
+    op.create_index('ix_archived_daily_sales_day', 'archived_daily_sales', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_archived_daily_sales_day', table_name='archived_daily_sales')
+    op.drop_table('archived_daily_sales')
+    op.drop_table('order_archives')
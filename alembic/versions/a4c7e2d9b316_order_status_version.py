@@ -0,0 +1,63 @@
+"""order_status_version
+
+Revision ID: a4c7e2d9b316
+Revises: f8b3d6a1c927
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2d9b316'
+down_revision: Union[str, Sequence[str], None] = 'f8b3d6a1c927'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as the f8b3d6a1c927 backfill, for a given set of statuses
+PREP_COUNTS_SQL = """
+    INSERT INTO kitchen_prep_counts (store_id, product_id, options, product_name, quantity)
+    SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+           oi.product_id,
+           COALESCE(opts.options, ''),
+           MAX(oi.product_name),
+           SUM(oi.quantity)
+    FROM orders o
+    JOIN order_items oi ON oi.order_id = o.id AND oi.order_created_at = o.created_at
+    LEFT JOIN LATERAL (
+        SELECT string_agg(oio.option_name, ', ' ORDER BY oio.option_name COLLATE "C") AS options
+        FROM order_item_options oio
+        WHERE oio.order_item_id = oi.id AND oio.order_created_at = oi.order_created_at
+    ) opts ON true
+    WHERE o.status IN ({statuses})
+    GROUP BY 1, 2, 3
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant default: no table rewrite on Postgres 11+
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    op.drop_index('ix_orders_pending', table_name='orders')
+    op.create_index('ix_orders_active', 'orders', ['store_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status IN ('pending', 'preparing', 'ready')"))
+
+    # Preparing orders are now counted on the prep board
+    op.execute('DELETE FROM kitchen_prep_counts')
+    op.execute(PREP_COUNTS_SQL.format(statuses="'pending', 'preparing'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('DELETE FROM kitchen_prep_counts')
+    op.execute(PREP_COUNTS_SQL.format(statuses="'pending'"))
+
+    op.drop_index('ix_orders_active', table_name='orders')
+    op.create_index('ix_orders_pending', 'orders', ['store_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+
+    op.drop_column('orders', 'version')
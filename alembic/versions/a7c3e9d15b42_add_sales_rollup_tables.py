@@ -0,0 +1,69 @@
+"""add_sales_rollup_tables
+
+Revision ID: a7c3e9d15b42
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d15b42'
+down_revision: Union[str, Sequence[str], None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sales_hourly_rollups',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('hour', sa.Integer(), nullable=False),
+    sa.Column('order_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('store_id', 'day', 'hour')
+    )
+    op.create_table('product_daily_rollups',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('store_id', 'day', 'product_name')
+    )
+
+    # Backfill from existing completed orders
+    op.execute("""
+        INSERT INTO sales_hourly_rollups (store_id, day, hour, order_count, revenue)
+        SELECT COALESCE(store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+               created_at::date,
+               EXTRACT(HOUR FROM created_at)::int,
+               COUNT(id),
+               SUM(total_price)
+        FROM orders
+        WHERE status = 'completed'
+        GROUP BY 1, 2, 3
+    """)
+    op.execute("""
+        INSERT INTO product_daily_rollups (store_id, day, product_name, quantity, revenue)
+        SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+               o.created_at::date,
+               oi.product_name,
+               SUM(oi.quantity),
+               SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.status = 'completed'
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('product_daily_rollups')
+    op.drop_table('sales_hourly_rollups')
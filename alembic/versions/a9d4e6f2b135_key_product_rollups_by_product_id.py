@@ -0,0 +1,86 @@
+"""key_product_rollups_by_product_id
+
+Revision ID: a9d4e6f2b135
+Revises: e3b7c1d9a524
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e6f2b135'
+down_revision: Union[str, Sequence[str], None] = 'e3b7c1d9a524'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Re-keyed from product_name to product_id; the rows are rebuilt from orders
+    op.drop_index('ix_product_daily_rollups_day', table_name='product_daily_rollups')
+    op.drop_table('product_daily_rollups')
+    op.create_table('product_daily_rollups',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('store_id', 'day', 'product_id')
+    )
+    op.create_index('ix_product_daily_rollups_day', 'product_daily_rollups', ['day'], unique=False)
+
+    # Each product gets the name of its most recent order item
+    op.execute("""
+        WITH latest AS (
+            SELECT DISTINCT ON (oi.product_id) oi.product_id, oi.product_name
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            ORDER BY oi.product_id, o.created_at DESC, oi.id DESC
+        )
+        INSERT INTO product_daily_rollups (store_id, day, product_id, product_name, quantity, revenue)
+        SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+               o.created_at::date,
+               oi.product_id,
+               latest.product_name,
+               SUM(oi.quantity),
+               SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN latest ON latest.product_id = oi.product_id
+        WHERE o.status = 'completed'
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_daily_rollups_day', table_name='product_daily_rollups')
+    op.drop_table('product_daily_rollups')
+    op.create_table('product_daily_rollups',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('store_id', 'day', 'product_name')
+    )
+    op.create_index('ix_product_daily_rollups_day', 'product_daily_rollups', ['day'], unique=False)
+
+    op.execute("""
+        INSERT INTO product_daily_rollups (store_id, day, product_name, quantity, revenue)
+        SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+               o.created_at::date,
+               oi.product_name,
+               SUM(oi.quantity),
+               SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        WHERE o.status = 'completed'
+        GROUP BY 1, 2, 3
+    """)
@@ -0,0 +1,44 @@
+"""add_order_access_indexes
+
+Revision ID: b4d81f6a2c90
+Revises: a7c3e9d15b42
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d81f6a2c90'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9d15b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Per-store dashboards / sales reports: store_id = ? AND status = ? AND created_at range
+    op.create_index('ix_orders_store_status_created', 'orders', ['store_id', 'status', 'created_at'], unique=False)
+    # Admin reports across all stores: created_at range only
+    op.create_index('ix_orders_created_at', 'orders', ['created_at'], unique=False)
+    # Kitchen view: small partial index over the pending orders only
+    op.create_index('ix_orders_pending', 'orders', ['store_id', 'created_at'], unique=False,
+                    postgresql_where=sa.text("status = 'pending'"))
+    op.create_index(op.f('ix_order_items_order_id'), 'order_items', ['order_id'], unique=False)
+    op.create_index(op.f('ix_order_item_options_order_item_id'), 'order_item_options', ['order_item_id'], unique=False)
+    op.create_index('ix_sales_hourly_rollups_day', 'sales_hourly_rollups', ['day'], unique=False)
+    op.create_index('ix_product_daily_rollups_day', 'product_daily_rollups', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_product_daily_rollups_day', table_name='product_daily_rollups')
+    op.drop_index('ix_sales_hourly_rollups_day', table_name='sales_hourly_rollups')
+    op.drop_index(op.f('ix_order_item_options_order_item_id'), table_name='order_item_options')
+    op.drop_index(op.f('ix_order_items_order_id'), table_name='order_items')
+    op.drop_index('ix_orders_pending', table_name='orders', postgresql_where=sa.text("status = 'pending'"))
+    op.drop_index('ix_orders_created_at', table_name='orders')
+    op.drop_index('ix_orders_store_status_created', table_name='orders')
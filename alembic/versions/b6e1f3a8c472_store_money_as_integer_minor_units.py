@@ -0,0 +1,80 @@
+"""store_money_as_integer_minor_units
+
+Revision ID: b6e1f3a8c472
+Revises: a9d4e6f2b135
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1f3a8c472'
+down_revision: Union[str, Sequence[str], None] = 'a9d4e6f2b135'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Float amounts become BIGINT minor units (x100), see app/models/types.py
+MONEY_COLUMNS = [
+    ('products', 'base_price', False),
+    ('product_options', 'price_delta', False),
+    ('orders', 'total_price', False),
+    ('order_items', 'unit_price', False),
+    ('order_item_options', 'price_delta', False),
+    ('sales_hourly_rollups', 'revenue', False),
+    ('product_daily_rollups', 'revenue', False),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column, nullable in MONEY_COLUMNS:
+        op.alter_column(table, column,
+                        existing_type=sa.Float(),
+                        type_=sa.BigInteger(),
+                        existing_nullable=nullable,
+                        postgresql_using=f'round({column} * 100)::bigint')
+
+    # Rollups were summed from floats; recompute them exactly from the converted rows
+    op.execute("""
+        UPDATE sales_hourly_rollups r
+        SET revenue = s.revenue
+        FROM (
+            SELECT COALESCE(store_id, '00000000-0000-0000-0000-000000000000'::uuid) AS store_id,
+                   created_at::date AS day,
+                   EXTRACT(HOUR FROM created_at)::int AS hour,
+                   SUM(total_price) AS revenue
+            FROM orders
+            WHERE status = 'completed'
+            GROUP BY 1, 2, 3
+        ) s
+        WHERE r.store_id = s.store_id AND r.day = s.day AND r.hour = s.hour
+    """)
+    op.execute("""
+        UPDATE product_daily_rollups r
+        SET revenue = s.revenue
+        FROM (
+            SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid) AS store_id,
+                   o.created_at::date AS day,
+                   oi.product_id,
+                   SUM(oi.quantity * oi.unit_price) AS revenue
+            FROM order_items oi
+            JOIN orders o ON o.id = oi.order_id
+            WHERE o.status = 'completed'
+            GROUP BY 1, 2, 3
+        ) s
+        WHERE r.store_id = s.store_id AND r.day = s.day AND r.product_id = s.product_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, column, nullable in MONEY_COLUMNS:
+        op.alter_column(table, column,
+                        existing_type=sa.BigInteger(),
+                        type_=sa.Float(),
+                        existing_nullable=nullable,
+                        postgresql_using=f'{column} / 100.0')
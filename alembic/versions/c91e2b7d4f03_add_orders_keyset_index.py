@@ -0,0 +1,30 @@
+"""add_orders_keyset_index
+
+Revision ID: c91e2b7d4f03
+Revises: b4d81f6a2c90
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c91e2b7d4f03'
+down_revision: Union[str, Sequence[str], None] = 'b4d81f6a2c90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset pagination of GET /orders: WHERE store_id = ? AND (created_at, id) < (?, ?)
+    # ORDER BY created_at DESC, id DESC
+    op.create_index('ix_orders_store_created_id', 'orders', ['store_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_orders_store_created_id', table_name='orders')
@@ -0,0 +1,41 @@
+"""add_order_idempotency_keys
+
+Revision ID: d2f5a8c13e67
+Revises: c91e2b7d4f03
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f5a8c13e67'
+down_revision: Union[str, Sequence[str], None] = 'c91e2b7d4f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('order_idempotency_keys',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('order_id', sa.UUID(), nullable=False),
+    sa.Column('request_hash', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('store_id', 'key')
+    )
+    op.create_index(op.f('ix_order_idempotency_keys_order_id'), 'order_idempotency_keys', ['order_id'], unique=False)
+    op.create_index(op.f('ix_order_idempotency_keys_created_at'), 'order_idempotency_keys', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_order_idempotency_keys_created_at'), table_name='order_idempotency_keys')
+    op.drop_index(op.f('ix_order_idempotency_keys_order_id'), table_name='order_idempotency_keys')
+    op.drop_table('order_idempotency_keys')
@@ -0,0 +1,55 @@
+"""add_kitchen_prep_counts
+
+Revision ID: f8b3d6a1c927
+Revises: 7d2a4c9e1b58
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8b3d6a1c927'
+down_revision: Union[str, Sequence[str], None] = '7d2a4c9e1b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('kitchen_prep_counts',
+    sa.Column('store_id', sa.UUID(), nullable=False),
+    sa.Column('product_id', sa.UUID(), nullable=False),
+    sa.Column('options', sa.String(length=200), nullable=False),
+    sa.Column('product_name', sa.String(length=100), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.PrimaryKeyConstraint('store_id', 'product_id', 'options')
+    )
+
+    # Option names sorted by code point (COLLATE "C"), as app/crud/prep_board.py does
+    op.execute("""
+        INSERT INTO kitchen_prep_counts (store_id, product_id, options, product_name, quantity)
+        SELECT COALESCE(o.store_id, '00000000-0000-0000-0000-000000000000'::uuid),
+               oi.product_id,
+               COALESCE(opts.options, ''),
+               MAX(oi.product_name),
+               SUM(oi.quantity)
+        FROM orders o
+        JOIN order_items oi ON oi.order_id = o.id AND oi.order_created_at = o.created_at
+        LEFT JOIN LATERAL (
+            SELECT string_agg(oio.option_name, ', ' ORDER BY oio.option_name COLLATE "C") AS options
+            FROM order_item_options oio
+            WHERE oio.order_item_id = oi.id AND oio.order_created_at = oi.order_created_at
+        ) opts ON true
+        WHERE o.status = 'pending'
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('kitchen_prep_counts')
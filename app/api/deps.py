@@ -1,15 +1,19 @@
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, AsyncSessionLocal
 from app.models.store import Store
+from app.core.store_cache import store_cache, CachedStore
 import uuid
+import time
+from typing import Optional
 
 from app.core.security import ALGORITHM, SECRET_KEY
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token")
+oauth2_scheme_optional = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token", auto_error=False)
 
 credentials_exception = HTTPException(
     status_code=status.HTTP_401_UNAUTHORIZED,
@@ -28,32 +32,90 @@ def get_current_admin(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return username
 
-def get_current_store(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def authorize_store_token(payload: dict, db: AsyncSession) -> CachedStore:
+    """
+    Check a decoded store token against the store's current state: the store
+    must exist, be active, and the token's "ver" must match its token_version.
+    Served from store_cache; the database is only read on a cache miss.
+    """
+    try:
+        store_uuid = uuid.UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise credentials_exception
+
+    store = store_cache.get(store_uuid)
+    if store is None:
+        db_store = await db.get(Store, store_uuid)
+        if db_store:
+            store = CachedStore.from_model(db_store)
+        else:
+            # Remember deleted stores too, so their tokens stay cheap to reject
+            store = CachedStore(id=store_uuid, name="", is_active=False)
+        store_cache.put(store)
+
+    if not store.is_active:
+        raise HTTPException(status_code=401, detail="Store inactive or not found")
+    if payload.get("ver", 0) != store.token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return store
+
+async def get_current_store(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        store_id: str = payload.get("sub")
-        role: str = payload.get("role")
-        if store_id is None or role != "store":
+        if payload.get("sub") is None or payload.get("role") != "store":
             raise credentials_exception
     except JWTError:
         raise credentials_exception
-        
-    # Verify store exists and is active
+    return await authorize_store_token(payload, db)
+
+async def get_current_actor(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """
+    Admin or store token payload. Store tokens are checked the same way as in
+    get_current_store, so a revoked or deactivated store cannot keep reading.
+    """
     try:
-        store_uuid = uuid.UUID(store_id)
-    except ValueError:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
         raise credentials_exception
+    if payload.get("role") == "store":
+        await authorize_store_token(payload, db)
+    return payload
 
-    store = db.query(Store).filter(Store.id == store_uuid).first()
-    if not store or not store.is_active:
-        raise HTTPException(status_code=401, detail="Store inactive or not found")
-        
-    return store
-
-def get_current_actor(token: str = Depends(oauth2_scheme)):
+async def get_stream_actor(
+    token: Optional[str] = Query(None),
+    header_token: Optional[str] = Depends(oauth2_scheme_optional)
+):
+    """
+    Same as get_current_actor, but also accepts ?token= because the
+    browser EventSource API cannot set an Authorization header.
+    Uses its own short session: a request-scoped one would hold a pooled
+    connection for as long as the stream stays open.
+    """
+    token = header_token or token
+    if not token:
+        raise credentials_exception
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise credentials_exception
+    if payload.get("role") == "store":
+        async with AsyncSessionLocal() as db:
+            await authorize_store_token(payload, db)
+    return payload
 
+async def stream_actor_still_valid(payload: dict) -> bool:
+    """
+    Re-check an open stream's token: it must not have expired and, for a
+    store, the store must still be active with the same token_version.
+    Served from store_cache; a session is only used on a cache miss.
+    """
+    if payload.get("exp") is not None and payload["exp"] < time.time():
+        return False
+    if payload.get("role") != "store":
+        return True
+    try:
+        async with AsyncSessionLocal() as db:
+            await authorize_store_token(payload, db)
+    except HTTPException:
+        return False
+    return True
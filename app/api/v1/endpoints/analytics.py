@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.crud import analytics
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_read_db, async_read_sessionmaker
+from app.core.config import settings
+from app.core.result_cache import CoalescingCache
+from app.crud.aio import analytics
+from app.models.types import ZERO, CENT
 from typing import List, Any, Optional
 import uuid
 from app.api.deps import get_current_actor
 
 router = APIRouter()
 
+dashboard_cache = CoalescingCache(ttl=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
 def get_filter_store_id(payload: dict, store_id: Optional[uuid.UUID]):
     role = payload.get("role", "admin")
     if role == "store":
@@ -15,8 +20,8 @@ def get_filter_store_id(payload: dict, store_id: Optional[uuid.UUID]):
     return store_id
 
 @router.get("/stats")
-def get_dashboard_stats(
-    db: Session = Depends(get_db), 
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_read_db), 
     payload: dict = Depends(get_current_actor),
     store_id: Optional[uuid.UUID] = Query(None)
 ):
@@ -25,12 +30,12 @@ def get_dashboard_stats(
     """
     filter_id = get_filter_store_id(payload, store_id)
     
-    daily_rev = analytics.get_daily_revenue(db, store_id=filter_id)
-    daily_cnt = analytics.get_daily_order_count(db, store_id=filter_id)
-    total_rev = analytics.get_total_revenue(db, store_id=filter_id)
+    daily_rev = await analytics.get_daily_revenue(db, store_id=filter_id)
+    daily_cnt = await analytics.get_daily_order_count(db, store_id=filter_id)
+    total_rev = await analytics.get_total_revenue(db, store_id=filter_id)
     
     # Calculate AOV (Average Order Value) for today
-    daily_aov = daily_rev / daily_cnt if daily_cnt > 0 else 0
+    daily_aov = (daily_rev / daily_cnt).quantize(CENT) if daily_cnt > 0 else ZERO
     
     return {
         "today_revenue": daily_rev,
@@ -39,9 +44,29 @@ def get_dashboard_stats(
         "total_revenue": total_rev
     }
 
+@router.get("/dashboard")
+async def get_dashboard(
+    payload: dict = Depends(get_current_actor),
+    store_id: Optional[uuid.UUID] = Query(None)
+):
+    """
+    Everything the admin dashboard shows in one response:
+    stats (as /stats), daily_trend (as /daily-trend), hourly (as /trend)
+    and top_products (as /top-products). Computed in a single query and
+    cached for a few seconds per (store_id, role).
+    """
+    filter_id = get_filter_store_id(payload, store_id)
+    role = payload.get("role", "admin")
+
+    async def compute():
+        async with (await async_read_sessionmaker())() as db:
+            return await analytics.get_dashboard(db, store_id=filter_id)
+
+    return await dashboard_cache.get_or_compute((filter_id, role), compute)
+
 @router.get("/daily-trend")
-def get_daily_trend(
-    db: Session = Depends(get_db), 
+async def get_daily_trend(
+    db: AsyncSession = Depends(get_async_read_db), 
     payload: dict = Depends(get_current_actor),
     store_id: Optional[uuid.UUID] = Query(None)
 ):
@@ -49,11 +74,11 @@ def get_daily_trend(
     Get sales trend for the last 30 days
     """
     filter_id = get_filter_store_id(payload, store_id)
-    return analytics.get_daily_sales_trend(db, store_id=filter_id)
+    return await analytics.get_daily_sales_trend(db, store_id=filter_id)
 
 @router.get("/trend")
-def get_hourly_trend(
-    db: Session = Depends(get_db), 
+async def get_hourly_trend(
+    db: AsyncSession = Depends(get_async_read_db), 
     payload: dict = Depends(get_current_actor),
     store_id: Optional[uuid.UUID] = Query(None)
 ):
@@ -61,11 +86,11 @@ def get_hourly_trend(
     Get hourly sales trend for today
     """
     filter_id = get_filter_store_id(payload, store_id)
-    return analytics.get_hourly_sales(db, store_id=filter_id)
+    return await analytics.get_hourly_sales(db, store_id=filter_id)
 
 @router.get("/top-products")
-def get_top_products(
-    db: Session = Depends(get_db), 
+async def get_top_products(
+    db: AsyncSession = Depends(get_async_read_db), 
     payload: dict = Depends(get_current_actor),
     store_id: Optional[uuid.UUID] = Query(None)
 ):
@@ -73,4 +98,4 @@ def get_top_products(
     Get top 5 selling products
     """
     filter_id = get_filter_store_id(payload, store_id)
-    return analytics.get_top_products(db, store_id=filter_id)
+    return await analytics.get_top_products(db, store_id=filter_id)
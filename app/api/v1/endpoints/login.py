@@ -1,7 +1,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import create_access_token, verify_and_update_password
 import os
 from datetime import timedelta
 
@@ -31,16 +31,19 @@ def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
         "token_type": "bearer",
     }
 
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 from app.models.store import Store
+from app.core.store_cache import store_cache, CachedStore
 
 @router.post("/login/store")
-def login_store(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_store(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     Store Login
     Username = Store Name
     Password = Store Password
+    Password checks run on the hashing pool; legacy hashes are upgraded on success.
     """
     username = form_data.username
     # Fix for potential encoding issues (UTF-8 bytes interpreted as Latin-1)
@@ -53,25 +56,34 @@ def login_store(form_data: OAuth2PasswordRequestForm = Depends(), db: Session =
     except Exception:
         pass
 
-    store = db.query(Store).filter(Store.name == username).first()
+    store = (await db.execute(select(Store).where(Store.name == username))).scalar_one_or_none()
     if not store:
         raise HTTPException(status_code=400, detail="Incorrect store name or password")
     
-    if not verify_password(form_data.password, store.password_hash):
+    ok, new_hash = await verify_and_update_password(form_data.password, store.password_hash)
+    if not ok:
         raise HTTPException(status_code=400, detail="Incorrect store name or password")
         
     if not store.is_active:
         raise HTTPException(status_code=400, detail="Store is inactive")
+    store_cache.put(CachedStore.from_model(store))
         
     access_token_expires = timedelta(minutes=60 * 24 * 7)
     access_token = create_access_token(
         data={
             "sub": str(store.id),
             "role": "store",
-            "store_name": store.name
+            "store_name": store.name,
+            # Checked against stores.token_version on every request (app/api/deps.py)
+            "ver": store.token_version
         }, 
         expires_delta=access_token_expires
     )
+
+    if new_hash:
+        # After the token is built: commit expires `store`
+        store.password_hash = new_hash
+        await db.commit()
     
     return {
         "access_token": access_token,
@@ -1,20 +1,33 @@
 # app/api/v1/endpoints/menu.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.db.session import get_db
-from app.schemas.product import Category as CategorySchema, CategoryCreate
+from app.db.session import get_db, get_async_db
+from app.schemas.product import Category as CategorySchema, CategoryCreate, ReorderSchema
 
 from app.crud import menu as crud_menu
+from app.crud.aio import menu as crud_menu_aio
 
 router = APIRouter()
 
 @router.get("/", response_model=List[CategorySchema])
-def get_menu(db: Session = Depends(get_db)):
+async def get_menu(request: Request, db: AsyncSession = Depends(get_async_db)):
     """
     獲取完整菜單，包含分類、產品及客製化選項
+    Served from a pre-encoded snapshot; clients sending a matching
+    If-None-Match get 304 Not Modified.
     """
-    return crud_menu.get_menu(db)
+    snapshot = await crud_menu_aio.get_menu_snapshot(db)
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if snapshot.etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
 
 from app.api.deps import get_current_admin
 
@@ -26,19 +39,12 @@ def create_category(category_in: CategoryCreate, db: Session = Depends(get_db),
     return crud_menu.create_category(db, category_in)
 
 @router.put("/reorder")
-def reorder_categories(payload: dict, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
+def reorder_categories(payload: ReorderSchema, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
     """
     { "items": [ {"id": "uuid", "sort_order": 1}, ... ] }
     """
-    if "items" not in payload:
-        raise HTTPException(status_code=400, detail="Missing items")
-    
-    mapping = {}
-    for item in payload["items"]:
-        mapping[item["id"]] = item["sort_order"]
-        
-    crud_menu.reorder_categories(db, mapping)
-    return {"message": "Categories reordered successfully"}
+    unknown_ids = crud_menu.reorder_categories(db, payload.to_mapping())
+    return {"message": "Categories reordered successfully", "unknown_ids": unknown_ids}
 
 @router.delete("/categories/{category_id}")
 def delete_category(category_id: str, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
@@ -1,64 +1,172 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.schemas.order import OrderCreate, OrderResponse, OrderUpdateStatus
+import json
+import hashlib
+import asyncio
+from datetime import date, datetime, time, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db, AsyncSessionLocal, read_sessionmaker
+from app.core.order_events import order_events
+from app.schemas.order import (
+    OrderCreate, OrderResponse, OrderUpdateStatus, BulkOrderCreate, BulkOrderResponse, PrepBoardLine,
+    BulkStatusUpdate, BulkStatusResponse
+)
 from typing import List
-from app.crud import order as crud_order
+from app.crud.aio import order as crud_order
+from app.crud.order import encode_cursor, iter_export_rows, iter_export_orders, EXPORT_COLUMNS
 
 router = APIRouter()
 
-from app.models.store import Store
-from app.api.deps import get_current_store, oauth2_scheme
-from app.core.security import ALGORITHM, SECRET_KEY
-from jose import jwt, JWTError
-from typing import Optional
+from app.core.store_cache import CachedStore
+from app.api.deps import get_current_store, get_current_actor, get_stream_actor, stream_actor_still_valid
+from typing import Optional, Literal
 from fastapi import Query
-
-def get_current_actor(token: str = Depends(oauth2_scheme)):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+import csv
+import io
 
 @router.post("/", response_model=OrderResponse)
-def create_order(
+async def create_order(
     order_in: OrderCreate, 
-    db: Session = Depends(get_db),
-    current_store: Store = Depends(get_current_store)
+    db: AsyncSession = Depends(get_async_db),
+    current_store: CachedStore = Depends(get_current_store),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=64)
 ):
     """
     建立訂單 (需 Store 權限)
+    - Idempotency-Key header: retries with the same key return the original
+      order instead of creating a duplicate (see IDEMPOTENCY_KEY_TTL_HOURS).
     """
-    return crud_order.create_order(db, order_in, store_id=current_store.id)
+    return await crud_order.create_order(db, order_in, store_id=current_store.id, idempotency_key=idempotency_key)
+
+@router.post("/bulk", response_model=BulkOrderResponse)
+async def create_orders_bulk(
+    bulk_in: BulkOrderCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_store: CachedStore = Depends(get_current_store)
+):
+    """
+    同步離線訂單 (需 Store 權限)
+    - Each order carries its own idempotency_key, so a queue can be resent
+      after a dropped connection; already synced orders come back as "duplicate".
+    - An invalid order is reported as "error" without failing the rest of the batch.
+    """
+    results = await crud_order.create_orders_bulk(db, bulk_in.orders, store_id=current_store.id)
+    return BulkOrderResponse(results=results)
 
 @router.get("/", response_model=List[OrderResponse])
-def get_all_orders(
-    db: Session = Depends(get_db), 
-    skip: int = 0, 
-    limit: int = 100,
+async def get_all_orders(
+    response: Response,
+    db: AsyncSession = Depends(get_async_db), 
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    status: Optional[str] = Query(None),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    skip: int = Query(0, ge=0, deprecated=True, description="Offset paging, use cursor instead"),
     store_id: Optional[uuid.UUID] = Query(None),
     payload: dict = Depends(get_current_actor)
 ):
     """
-    列出訂單
+    列出訂單 (newest first)
     - Admin: 可看所有 (或用 store_id 過濾)
     - Store: 只能看自己的
+    - Paging: pass the X-Next-Cursor response header back as `cursor`;
+      the header is absent on the last page.
     """
     role = payload.get("role", "admin")
     
     if role == "store":
         # Force filter by own store_id
-        current_store_id = uuid.UUID(payload.get("sub"))
-        return crud_order.get_orders(db, skip=skip, limit=limit, store_id=current_store_id)
-    
-    # Admin
-    return crud_order.get_orders(db, skip=skip, limit=limit, store_id=store_id)
+        store_id = uuid.UUID(payload.get("sub"))
+
+    orders = await crud_order.get_orders(
+        db,
+        skip=skip,
+        limit=limit,
+        store_id=store_id,
+        cursor=cursor,
+        status=status,
+        start=datetime.combine(start_date, time.min) if start_date else None,
+        end=datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None
+    )
+
+    if len(orders) == limit:
+        last = orders[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
+    if skip:
+        response.headers["Deprecation"] = "true"
+    return orders
+
+def _export_csv(filters: dict, flush_every: int = 500):
+    db = read_sessionmaker()()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        for i, row in enumerate(iter_export_rows(db, **filters), 1):
+            writer.writerow(row)
+            if i % flush_every == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+def _export_ndjson(filters: dict, flush_every: int = 100):
+    db = read_sessionmaker()()
+    try:
+        lines = []
+        for order in iter_export_orders(db, **filters):
+            lines.append(json.dumps(jsonable_encoder(order), ensure_ascii=False))
+            if len(lines) >= flush_every:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
+    finally:
+        db.close()
+
+@router.get("/export")
+def export_orders(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    store_id: Optional[uuid.UUID] = Query(None),
+    payload: dict = Depends(get_current_actor)
+):
+    """
+    匯出訂單明細 (streamed)
+    - csv: one row per order item option (items without options get one row)
+    - ndjson: one order per line with nested items and options
+    - Admin: 可匯出所有 (或用 store_id 過濾); Store: 只能匯出自己的
+    """
+    if payload.get("role", "admin") == "store":
+        store_id = uuid.UUID(payload.get("sub"))
+
+    filters = {
+        "store_id": store_id,
+        "start": datetime.combine(start_date, time.min) if start_date else None,
+        "end": datetime.combine(end_date + timedelta(days=1), time.min) if end_date else None,
+    }
+
+    if format == "ndjson":
+        return StreamingResponse(
+            _export_ndjson(filters),
+            media_type="application/x-ndjson",
+            headers={"Content-Disposition": 'attachment; filename="orders.ndjson"'}
+        )
+    return StreamingResponse(
+        _export_csv(filters),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="orders.csv"'}
+    )
 
 @router.get("/active", response_model=List[OrderResponse])
-def get_active_orders(
-    db: Session = Depends(get_db),
+async def get_active_orders(
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(get_current_actor)
 ):
     """
@@ -72,27 +180,162 @@ def get_active_orders(
     if role == "store":
         fil_store_id = uuid.UUID(payload.get("sub"))
         
-    return crud_order.get_active_orders(db, store_id=fil_store_id)
+    return await crud_order.get_active_orders(db, store_id=fil_store_id)
+
+@router.get("/prep-board", response_model=List[PrepBoardLine])
+async def get_prep_board(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(get_current_actor)
+):
+    """
+    廚房備餐看板: units still to make per product + options over the pending
+    and preparing orders, largest first. Maintained incrementally, so this is one small
+    read; clients sending a matching If-None-Match get 304 Not Modified.
+    - Admin: 所有分店合計
+    - Store: 只看自己的
+    """
+    fil_store_id = None
+    if payload.get("role", "admin") == "store":
+        fil_store_id = uuid.UUID(payload.get("sub"))
+
+    board = await crud_order.get_prep_board(db, store_id=fil_store_id)
+    body = json.dumps(jsonable_encoder(board), ensure_ascii=False, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _active_orders_snapshot(store_id: Optional[uuid.UUID]):
+    async with AsyncSessionLocal() as db:
+        orders = await crud_order.get_active_orders(db, store_id=store_id)
+    return [o.model_dump(mode="json") for o in orders]
+
+def _sse(event: str, seq: int, data) -> str:
+    return f"id: {order_events.event_id(seq)}\nevent: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@router.get("/stream")
+async def stream_active_orders(
+    request: Request,
+    last_event_id: Optional[str] = Query(None),
+    payload: dict = Depends(get_stream_actor)
+):
+    """
+    進行中訂單即時推播 (Server-Sent Events, Kitchen View)
+    - First event is a `snapshot` of all active (pending / preparing / ready) orders, then
+      `order_created` / `order_updated` / `order_deleted` deltas.
+    - Reconnecting with Last-Event-ID resumes from that event when it is
+      still in the server's history, otherwise a new snapshot is sent.
+    """
+    role = payload.get("role", "admin")
+
+    fil_store_id = None
+    if role == "store":
+        fil_store_id = uuid.UUID(payload.get("sub"))
+
+    last_seq = order_events.parse_event_id(request.headers.get("last-event-id") or last_event_id)
+    sub, current_seq, backlog = order_events.subscribe(fil_store_id, last_seq)
+
+    async def event_stream():
+        try:
+            if backlog is None:
+                snapshot = await _active_orders_snapshot(fil_store_id)
+                yield _sse("snapshot", current_seq, snapshot)
+            else:
+                for event in backlog:
+                    yield _sse(event.type, event.seq, event.data)
+
+            while not sub.overflowed:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    if not await stream_actor_still_valid(payload):
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                # A store deactivated or revoked since the stream opened gets no more orders
+                if not await stream_actor_still_valid(payload):
+                    break
+                yield _sse(event.type, event.seq, event.data)
+            # On overflow or revocation the stream ends; the client reconnects
+            # and resumes, or is refused with 401
+        finally:
+            order_events.unsubscribe(sub)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.patch("/{order_id}/status", response_model=OrderResponse)
-def update_order_status(
+async def update_order_status(
     order_id: uuid.UUID, 
     status_update: OrderUpdateStatus, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(get_current_actor)
 ):
     """
     更新訂單狀態 (Admin or Store)
+    pending → preparing → ready → completed / cancelled; other changes are 409.
+    Send the order's `version` to get 409 instead of overwriting a change
+    made meanwhile on another screen.
+    - Store: 只能更新自己的訂單
     """
-    return crud_order.update_order_status(db, order_id, status_update.status)
+    store_id = None
+    if payload.get("role", "admin") == "store":
+        store_id = uuid.UUID(payload.get("sub"))
+
+    order = await crud_order.update_order_status(
+        db, order_id, status_update.status, version=status_update.version, store_id=store_id
+    )
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+@router.patch("/status", response_model=BulkStatusResponse)
+async def update_orders_status(
+    update_in: BulkStatusUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    payload: dict = Depends(get_current_actor)
+):
+    """
+    批次更新訂單狀態 (Admin or Store)
+    Moves every listed order to `status` in one conditional update. An order
+    only moves if it still has the status and version sent with it; otherwise
+    its result is `conflict` with the current status and version.
+    - Store: 只能更新自己的訂單
+    """
+    store_id = None
+    if payload.get("role", "admin") == "store":
+        store_id = uuid.UUID(payload.get("sub"))
+
+    results = await crud_order.transition_orders(db, update_in.orders, update_in.status, store_id=store_id)
+    return BulkStatusResponse(results=results)
 
 @router.delete("/{order_id}", response_model=OrderResponse)
-def delete_order(
+async def delete_order(
     order_id: uuid.UUID, 
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     payload: dict = Depends(get_current_actor)
 ):
     """
     刪除訂單
+    - Store: 只能刪除自己的訂單
     """
-    return crud_order.delete_order(db, order_id)
\ No newline at end of file
+    store_id = None
+    if payload.get("role", "admin") == "store":
+        store_id = uuid.UUID(payload.get("sub"))
+
+    order = await crud_order.delete_order(db, order_id, store_id=store_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from app.db.session import get_db
-from app.schemas.product import Product, ProductUpdate, ProductCreate
+from app.schemas.product import Product, ProductUpdate, ProductCreate, ReorderSchema
 from app.crud import product as crud_product
 
 router = APIRouter()
@@ -29,19 +29,12 @@ def update_product(name: str, product_in: ProductUpdate, db: Session = Depends(g
     return crud_product.update_product_by_name(db, product, product_in)
 
 @router.put("/reorder")
-def reorder_products(payload: dict, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
+def reorder_products(payload: ReorderSchema, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
     """
     { "items": [ {"id": "uuid", "sort_order": 1}, ... ] }
     """
-    if "items" not in payload:
-        raise HTTPException(status_code=400, detail="Missing items")
-    
-    mapping = {}
-    for item in payload["items"]:
-        mapping[item["id"]] = item["sort_order"]
-        
-    crud_product.reorder_products(db, mapping)
-    return {"message": "Products reordered successfully"}
+    unknown_ids = crud_product.reorder_products(db, payload.to_mapping())
+    return {"message": "Products reordered successfully", "unknown_ids": unknown_ids}
 
 @router.delete("/{product_id}")
 def delete_product(product_id: str, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.models.order import Order
+from app.models.types import ZERO
 from typing import Optional, Dict
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 
 
 
@@ -14,16 +15,27 @@ import uuid
 
 router = APIRouter()
 
+def date_range_filters(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Half-open [start, end + 1 day) range on Order.created_at so the index can be used.
+    """
+    filters = []
+    if start_date:
+        filters.append(Order.created_at >= datetime.combine(start_date, time.min))
+    if end_date:
+        filters.append(Order.created_at < datetime.combine(end_date + timedelta(days=1), time.min))
+    return filters
+
 @router.get("/stats")
 def get_sales_stats(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     store_id: Optional[uuid.UUID] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     payload: dict = Depends(get_current_actor)
 ):
     """
-    Get aggregated sales statistics.
+    Get aggregated sales statistics of completed orders, like the rollups.
     If no dates provided, returns overall stats (all time).
     - Admin: Can see all or filter by store_id
     - Store: Can only see own stats
@@ -39,7 +51,7 @@ def get_sales_stats(
     query = db.query(
         func.count(Order.id).label("total_orders"),
         func.sum(Order.total_price).label("total_sales")
-    )
+    ).filter(Order.status == "completed")
     
     # Filter by store if applicable
     if filter_store_id:
@@ -47,49 +59,25 @@ def get_sales_stats(
 
     
     # Filter by date range if provided
-    if start_date:
-        query = query.filter(func.date(Order.created_at) >= start_date)
-    if end_date:
-        query = query.filter(func.date(Order.created_at) <= end_date)
+    query = query.filter(*date_range_filters(start_date, end_date))
         
     result = query.first()
     
-    total_orders = result.total_orders or 0
-    total_sales = result.total_sales or 0.0
+    # Months moved to the cold archive only have daily totals left
+    from app.crud import analytics
+    archived_orders, archived_sales = analytics.get_archived_sales(db, filter_store_id, start_date, end_date)
+
+    total_orders = (result.total_orders or 0) + archived_orders
+    total_sales = (result.total_sales or ZERO) + archived_sales
     
     # Calculate Average Order Value
-    avg_order_value = total_sales / total_orders if total_orders > 0 else 0
+    avg_order_value = total_sales / total_orders if total_orders > 0 else ZERO
     
     # --- Product Sales Breakdown ---
-    from app.models.order import OrderItem
-    
-    prod_query = db.query(
-        OrderItem.product_name,
-        func.sum(OrderItem.quantity).label("total_quantity"),
-        func.sum(OrderItem.quantity * OrderItem.unit_price).label("product_revenue")
-    ).join(Order, Order.id == OrderItem.order_id)
-    
-    # Filter by store if applicable
-    if filter_store_id:
-        prod_query = prod_query.filter(Order.store_id == filter_store_id)
-    
-    # Filter by date range if provided (same as above)
-    if start_date:
-        prod_query = prod_query.filter(func.date(Order.created_at) >= start_date)
-    if end_date:
-        prod_query = prod_query.filter(func.date(Order.created_at) <= end_date)
-        
-    prod_stats = prod_query.group_by(OrderItem.product_name)\
-        .order_by(func.sum(OrderItem.quantity).desc())\
-        .all()
-        
+    # From the per-day product rollup (completed orders only)
     products_data = [
-        {
-            "name": p.product_name,
-            "quantity": int(p.total_quantity or 0),
-            "revenue": float(p.product_revenue or 0)
-        }
-        for p in prod_stats
+        {"name": p["name"], "quantity": p["quantity"], "revenue": p["revenue"]}
+        for p in analytics.get_product_sales(db, filter_store_id, start_date, end_date)
     ]
     
     return {
@@ -109,7 +97,7 @@ def get_sales_stats(
 def get_sales_overview(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_admin: str = Depends(get_current_admin)
 ):
     """
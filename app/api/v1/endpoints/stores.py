@@ -8,6 +8,7 @@ from app.db.session import get_db
 from app.api.deps import get_current_admin
 from app.schemas.store import Store as StoreSchema, StoreCreate, StoreUpdate
 from app.crud import store as crud_store
+from app.core.store_cache import store_cache
 
 router = APIRouter()
 
@@ -18,6 +19,13 @@ def get_stores(db: Session = Depends(get_db)):
     """
     return crud_store.get_stores(db)
 
+@router.get("/cache-stats")
+def get_store_cache_stats(current_admin: str = Depends(get_current_admin)):
+    """
+    Hit/miss counters of the authenticated store lookup cache (Admin only)
+    """
+    return store_cache.stats()
+
 @router.post("/", response_model=StoreSchema)
 def create_store(store_in: StoreCreate, db: Session = Depends(get_db), current_admin: str = Depends(get_current_admin)):
     """
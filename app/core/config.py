@@ -1,4 +1,5 @@
 # app/core/config.py
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -6,7 +7,52 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str
     POSTGRES_DB: str
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Read replica for analytics, sales reports and exports; defaults to the
+    # primary. With a max staleness, reads fall back to the primary while the
+    # replica's lag (checked every REPLICA_LAG_CHECK_SECONDS) is above it.
+    REPLICA_DATABASE_URL: Optional[str] = None
+    REPLICA_MAX_STALENESS_SECONDS: Optional[float] = None
+    REPLICA_LAG_CHECK_SECONDS: float = 5.0
+
+    # Connection pool / query limits, applied to both the sync and async engines
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
+    # Store token authorization state (app/core/store_cache.py); the TTL bounds
+    # how long a revocation made by another API process takes to apply here
+    STORE_CACHE_SIZE: int = 1024
+    STORE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Password hashing pool (app/core/security.py); logins beyond the pending
+    # limit get 503 + Retry-After instead of queueing without bound
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # Successful store logins skip re-verification for this long
+    LOGIN_CACHE_TTL_SECONDS: float = 300.0
+
+    # How long a retried POST /orders with the same Idempotency-Key replays the original
+    IDEMPOTENCY_KEY_TTL_HOURS: int = 24
+
+    # Monthly order partitions (app/db/partitions.py) are created this many
+    # months ahead at startup and by scripts/manage_order_partitions.py
+    ORDER_PARTITION_MONTHS_AHEAD: int = 3
+
+    # Closed months older than this many months are moved out of Postgres into
+    # Parquet files under ORDER_ARCHIVE_DIR by scripts/archive_orders.py
+    ORDER_ARCHIVE_DIR: str = "archive"
+    ORDER_ARCHIVE_AFTER_MONTHS: int = 3
+
+    # Statements slower than this are logged and counted on /metrics
+    SLOW_QUERY_MS: int = 200
+
+    # GET /analytics/dashboard result cache
+    DASHBOARD_CACHE_TTL_SECONDS: float = 10.0
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
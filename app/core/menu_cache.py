@@ -0,0 +1,48 @@
+# app/core/menu_cache.py
+import hashlib
+import threading
+from typing import NamedTuple, Optional
+
+class MenuSnapshot(NamedTuple):
+    version: int
+    etag: str
+    body: bytes
+
+class MenuCache:
+    """
+    In-process cache of the pre-encoded GET /menu payload.
+    Every menu write bumps the version; a snapshot built for an older
+    version is never served. Scope is one API process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Optional[MenuSnapshot] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self) -> Optional[MenuSnapshot]:
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+        return None
+
+    def store(self, version: int, body: bytes) -> MenuSnapshot:
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        snapshot = MenuSnapshot(version=version, etag=etag, body=body)
+        with self._lock:
+            # Only keep it if no write happened while it was being built
+            if version == self._version:
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._snapshot = None
+
+menu_cache = MenuCache()
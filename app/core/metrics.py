@@ -0,0 +1,167 @@
+# app/core/metrics.py
+import bisect
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+class RequestStats:
+    """Queries issued and DB time spent while serving one request."""
+    __slots__ = ("queries", "db_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+# Set by MetricsMiddleware for the duration of a request. Sync CRUD called via
+# run_sync or the threadpool runs in a copy of the request context, so engine
+# events can find the same RequestStats object.
+current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+class Histogram:
+    """
+    Prometheus-style cumulative histogram, one series per label tuple.
+    """
+
+    def __init__(self, name: str, help: str, buckets: tuple, labelnames: tuple):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self._series: dict = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+        i = bisect.bisect_left(self.buckets, value)
+        if i < len(self.buckets):
+            series[0][i] += 1
+        series[1] += 1
+        series[2] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, value_sum) in sorted(self._series.items()):
+            base = ",".join(f'{k}="{v}"' for k, v in zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {total}')
+            lines.append(f"{self.name}_sum{{{base}}} {value_sum}")
+            lines.append(f"{self.name}_count{{{base}}} {total}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Per-route request metrics, rendered in the Prometheus text format on /metrics.
+    Routes are labelled by their path template so cardinality stays bounded.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        labels = ("method", "route")
+        self.latency = Histogram(
+            "http_request_duration_seconds", "Request latency", LATENCY_BUCKETS, labels)
+        self.db_time = Histogram(
+            "http_request_db_seconds", "Time spent in SQL per request", LATENCY_BUCKETS, labels)
+        self.queries = Histogram(
+            "http_request_db_queries", "SQL statements issued per request", QUERY_COUNT_BUCKETS, labels)
+        self.slow_queries = 0
+
+    def observe_request(self, method: str, route: str, stats: RequestStats, elapsed: float):
+        labels = (method, route)
+        with self._lock:
+            self.latency.observe(labels, elapsed)
+            self.db_time.observe(labels, stats.db_time)
+            self.queries.observe(labels, stats.queries)
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self) -> str:
+        with self._lock:
+            lines = self.latency.render() + self.db_time.render() + self.queries.render()
+            lines += [
+                "# HELP db_slow_queries_total Statements slower than SLOW_QUERY_MS",
+                "# TYPE db_slow_queries_total counter",
+                f"db_slow_queries_total {self.slow_queries}",
+            ]
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        metrics.record_slow_query()
+        logger.warning("Slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split())[:1000])
+
+def instrument_engine(engine: Engine):
+    """Count and time every statement executed on engine (use .sync_engine for async engines)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _route_label(scope) -> str:
+    # Path template of the matched route. Newer FastAPI resolves included
+    # routers lazily and keeps the un-prefixed route in scope["route"], with
+    # the full template on the effective route context.
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    path = getattr(context, "path", None) or getattr(scope.get("route"), "path", None)
+    return path or "unmatched"
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, query count and DB time per route, and
+    reporting them to the client in a Server-Timing header. Plain ASGI rather
+    than BaseHTTPMiddleware so streaming responses (SSE, exports) pass through
+    unbuffered; for those the header reflects the work done before the first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total = (time.perf_counter() - start) * 1000
+                timing = f"db;dur={stats.db_time * 1000:.1f};desc=\"{stats.queries} queries\", app;dur={total:.1f}"
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", timing.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            metrics.observe_request(
+                scope["method"],
+                _route_label(scope),
+                stats,
+                time.perf_counter() - start
+            )
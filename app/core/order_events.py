@@ -0,0 +1,94 @@
+# app/core/order_events.py
+import asyncio
+import threading
+import uuid
+from collections import deque
+from typing import NamedTuple, Optional
+
+class OrderEvent(NamedTuple):
+    seq: int
+    store_id: Optional[uuid.UUID]
+    type: str
+    data: dict
+
+class Subscription:
+    """
+    One connected kitchen screen. Events are handed over from the worker
+    thread that committed the order to the subscriber's event loop.
+    """
+
+    def __init__(self, store_id: Optional[uuid.UUID], max_pending: int = 1000):
+        self.store_id = store_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def matches(self, event: OrderEvent) -> bool:
+        return self.store_id is None or event.store_id == self.store_id
+
+    def offer(self, event: OrderEvent):
+        if self.matches(event):
+            self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event: OrderEvent):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: the stream resends a snapshot instead
+            self.overflowed = True
+
+class OrderEventBroker:
+    """
+    In-process publish/subscribe of order changes for the kitchen stream.
+    Keeps the last `history` events so a reconnecting screen can resume from
+    its last sequence number. Event ids are "<epoch>:<seq>"; the epoch changes
+    on every API restart, which forces clients back to a fresh snapshot.
+    """
+
+    def __init__(self, history: int = 1000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._history: deque = deque(maxlen=history)
+        self._subscribers: set = set()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    def parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        if not event_id:
+            return None
+        epoch, _, seq = event_id.partition(":")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def publish(self, store_id: Optional[uuid.UUID], type: str, data: dict):
+        with self._lock:
+            self._seq += 1
+            event = OrderEvent(self._seq, store_id, type, data)
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.offer(event)
+
+    def subscribe(self, store_id: Optional[uuid.UUID], last_seq: Optional[int] = None):
+        """
+        Register a subscriber. Returns (subscription, current_seq, backlog);
+        backlog is None when the client cannot resume and needs a snapshot.
+        """
+        sub = Subscription(store_id)
+        with self._lock:
+            self._subscribers.add(sub)
+            backlog = None
+            if last_seq is not None and last_seq <= self._seq:
+                oldest = self._history[0].seq if self._history else self._seq + 1
+                if last_seq >= oldest - 1:
+                    backlog = [e for e in self._history if e.seq > last_seq and sub.matches(e)]
+            return sub, self._seq, backlog
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+order_events = OrderEventBroker()
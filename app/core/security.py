@@ -1,8 +1,18 @@
 
+import asyncio
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
+from app.core.config import settings
 import os
 
 # Configuration from environment variables (or defaults)
@@ -10,14 +20,96 @@ SECRET_KEY = os.getenv("SECRET_KEY", "change_this_to_a_secure_random_string")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 10
 
+# New hashes use the first scheme; bcrypt hashes from older releases still
+# verify and are replaced with pbkdf2_sha256 on the next successful login.
 pwd_context = CryptContext(schemes=["pbkdf2_sha256", "bcrypt"], deprecated="auto")
 
+# Hashing is CPU-bound (tens of ms) and releases the GIL, so it runs on a small
+# dedicated pool instead of the event loop or the shared request threadpool.
+_hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+_pending_lock = threading.Lock()
+_pending = 0
+
+def _submit(fn, *args):
+    """
+    Queue a hashing job, refusing with 503 once PASSWORD_HASH_MAX_PENDING jobs
+    are already queued or running so a login storm cannot grow the backlog unbounded.
+    """
+    global _pending
+    with _pending_lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            raise HTTPException(status_code=503, detail="Too many logins in progress, retry shortly",
+                                headers={"Retry-After": "1"})
+        _pending += 1
+
+    def run():
+        global _pending
+        try:
+            return fn(*args)
+        finally:
+            with _pending_lock:
+                _pending -= 1
+    return _hash_pool.submit(run)
+
+class VerifiedLoginCache:
+    """
+    Short-lived memory of successful password checks, so a terminal logging in
+    again does not pay for another pbkdf2 run. Entries are keyed by an HMAC of
+    (stored hash, password) under a per-process random key: nothing reusable is
+    kept, and changing the password changes the stored hash and so the key.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def _digest(self, plain_password: str, hashed_password: str) -> bytes:
+        return hmac.new(self._key, f"{hashed_password}\0{plain_password}".encode(), hashlib.sha256).digest()
+
+    def check(self, plain_password: str, hashed_password: str) -> bool:
+        digest = self._digest(plain_password, hashed_password)
+        with self._lock:
+            expires = self._entries.get(digest)
+            if expires is None or expires < time.monotonic():
+                return False
+            self._entries.move_to_end(digest)
+            return True
+
+    def add(self, plain_password: str, hashed_password: str):
+        digest = self._digest(plain_password, hashed_password)
+        with self._lock:
+            self._entries[digest] = time.monotonic() + self.ttl
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+verified_logins = VerifiedLoginCache(ttl=settings.LOGIN_CACHE_TTL_SECONDS)
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    print(f"Hashing password: {password} (Type: {type(password)})")
-    return pwd_context.hash(password)
+    return _submit(pwd_context.hash, password).result()
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password on the hashing pool without blocking the event loop.
+    Returns (ok, new_hash); new_hash is set when the stored hash uses a
+    deprecated scheme or cost and should be replaced.
+    """
+    if verified_logins.check(plain_password, hashed_password):
+        return True, None
+    ok, new_hash = await asyncio.wrap_future(_submit(pwd_context.verify_and_update, plain_password, hashed_password))
+    if ok:
+        verified_logins.add(plain_password, new_hash or hashed_password)
+    return ok, new_hash
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
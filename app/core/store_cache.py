@@ -0,0 +1,79 @@
+# app/core/store_cache.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+from app.core.config import settings
+
+class CachedStore(NamedTuple):
+    id: uuid.UUID
+    name: str
+    is_active: bool
+    # Store tokens with an older "ver" claim are revoked
+    token_version: int = 0
+
+    @classmethod
+    def from_model(cls, store) -> "CachedStore":
+        return cls(id=store.id, name=store.name, is_active=store.is_active, token_version=store.token_version)
+
+class StoreCache:
+    """
+    Bounded LRU + TTL cache of store authorization state (active flag and
+    token version), so checking a store token needs no query.
+    crud.store writes the new state here on every change, which makes
+    deactivation and revocation immediate in this process; the TTL only
+    bounds staleness across API processes. Deleted stores are kept as
+    inactive entries so their tokens do not fall through to the database.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, store_id: uuid.UUID) -> Optional[CachedStore]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(store_id)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[store_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(store_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, store: CachedStore):
+        with self._lock:
+            self._entries[store.id] = (time.monotonic() + self.ttl, store)
+            self._entries.move_to_end(store.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, store_id: uuid.UUID):
+        with self._lock:
+            self._entries.pop(store_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+store_cache = StoreCache(maxsize=settings.STORE_CACHE_SIZE, ttl=settings.STORE_CACHE_TTL_SECONDS)
@@ -0,0 +1,26 @@
+import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import analytics
+
+# Async entry points for app/crud/analytics.py (see app/crud/aio/order.py)
+
+async def get_daily_sales_trend(db: AsyncSession, days: int = 30, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_daily_sales_trend, days=days, store_id=store_id)
+
+async def get_total_revenue(db: AsyncSession, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_total_revenue, store_id=store_id)
+
+async def get_daily_revenue(db: AsyncSession, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_daily_revenue, store_id=store_id)
+
+async def get_daily_order_count(db: AsyncSession, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_daily_order_count, store_id=store_id)
+
+async def get_hourly_sales(db: AsyncSession, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_hourly_sales, store_id=store_id)
+
+async def get_top_products(db: AsyncSession, limit: int = 5, store_id: uuid.UUID = None):
+    return await db.run_sync(analytics.get_top_products, limit=limit, store_id=store_id)
+
+async def get_dashboard(db: AsyncSession, store_id: uuid.UUID = None, days: int = 30, top_limit: int = 5):
+    return await db.run_sync(analytics.get_dashboard, store_id=store_id, days=days, top_limit=top_limit)
@@ -0,0 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.menu_cache import menu_cache, MenuSnapshot
+from app.crud import menu
+
+async def get_menu_snapshot(db: AsyncSession) -> MenuSnapshot:
+    """
+    Async counterpart of crud.menu.get_menu_snapshot.
+    Concurrent misses may each build a snapshot; the build lock of the sync
+    version is not used because it would block the event loop.
+    """
+    snapshot = menu_cache.get()
+    if snapshot:
+        return snapshot
+    return await db.run_sync(menu.build_menu_snapshot)
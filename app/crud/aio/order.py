@@ -0,0 +1,49 @@
+import uuid
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import order, prep_board
+from app.schemas.order import (
+    OrderCreate, OrderResponse, OfflineOrderCreate, BulkOrderResult, OrderStatusTransition, BulkStatusResult
+)
+
+# Async entry points for app/crud/order.py. The query logic is shared with the
+# sync module and runs through AsyncSession.run_sync, so the database I/O is
+# awaited on the event loop instead of pinning a threadpool worker. Responses
+# are built inside run_sync because lazy loads cannot happen outside of it.
+
+async def create_order(db: AsyncSession, order_in: OrderCreate, store_id: uuid.UUID = None, idempotency_key: Optional[str] = None) -> OrderResponse:
+    return await db.run_sync(
+        lambda session: order.create_order(session, order_in, store_id=store_id, idempotency_key=idempotency_key)
+    )
+
+async def create_orders_bulk(db: AsyncSession, orders_in: List[OfflineOrderCreate], store_id: uuid.UUID = None) -> List[BulkOrderResult]:
+    return await db.run_sync(lambda session: order.create_orders_bulk(session, orders_in, store_id=store_id))
+
+async def get_active_orders(db: AsyncSession, store_id: uuid.UUID = None) -> List[OrderResponse]:
+    def _active(session):
+        return [OrderResponse.model_validate(o) for o in order.get_active_orders(session, store_id=store_id)]
+    return await db.run_sync(_active)
+
+async def get_orders(db: AsyncSession, skip: int = 0, limit: int = 100, store_id: uuid.UUID = None, **filters) -> List[OrderResponse]:
+    def _orders(session):
+        return [
+            OrderResponse.model_validate(o)
+            for o in order.get_orders(session, skip=skip, limit=limit, store_id=store_id, **filters)
+        ]
+    return await db.run_sync(_orders)
+
+async def update_order_status(db: AsyncSession, order_id: uuid.UUID, status: str, version: int = None,
+                              store_id: uuid.UUID = None) -> Optional[OrderResponse]:
+    return await db.run_sync(
+        lambda session: order.update_order_status(session, order_id, status, version=version, store_id=store_id)
+    )
+
+async def transition_orders(db: AsyncSession, transitions: List[OrderStatusTransition], status: str,
+                            store_id: uuid.UUID = None) -> List[BulkStatusResult]:
+    return await db.run_sync(lambda session: order.transition_orders(session, transitions, status, store_id=store_id))
+
+async def delete_order(db: AsyncSession, order_id: uuid.UUID, store_id: uuid.UUID = None) -> Optional[OrderResponse]:
+    return await db.run_sync(lambda session: order.delete_order(session, order_id, store_id=store_id))
+
+async def get_prep_board(db: AsyncSession, store_id: uuid.UUID = None) -> List[dict]:
+    return await db.run_sync(prep_board.get_board, store_id=store_id)
@@ -1,64 +1,67 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, desc
+from sqlalchemy import func, desc, literal, cast, null, union_all, select, Date, Integer, String
 from datetime import datetime, timedelta, date
-from app.models.order import Order, OrderItem
+from app.models.analytics import SalesHourlyRollup as Hourly, ProductDailyRollup as ProductDaily, ArchivedDailySales
+from app.models.product import Product
+from app.models.types import ZERO, CENT
 
 import uuid
 
+# All queries read the pre-aggregated rollups (see app/crud/rollup.py),
+# which only contain completed orders.
+
 def get_daily_sales_trend(db: Session, days: int = 30, store_id: uuid.UUID = None):
     """
     Get completed sales count/revenue grouped by date for the last N days.
     """
     start_date = datetime.now().date() - timedelta(days=days)
     query = db.query(
-        func.date(Order.created_at).label('date'),
-        func.sum(Order.total_price).label('revenue'),
-        func.count(Order.id).label('count')
-    ).filter(Order.status == "completed")\
-     .filter(func.date(Order.created_at) >= start_date)
+        Hourly.day.label('date'),
+        func.sum(Hourly.revenue).label('revenue'),
+        func.sum(Hourly.order_count).label('count')
+    ).filter(Hourly.day >= start_date)
      
     if store_id:
-        query = query.filter(Order.store_id == store_id)
+        query = query.filter(Hourly.store_id == store_id)
         
-    results = query.group_by(func.date(Order.created_at))\
-     .order_by(func.date(Order.created_at))\
+    results = query.group_by(Hourly.day)\
+     .having(func.sum(Hourly.order_count) > 0)\
+     .order_by(Hourly.day)\
      .all()
      
-    return [{"date": str(r.date), "revenue": r.revenue, "count": r.count} for r in results]
+    return [{"date": str(r.date), "revenue": r.revenue, "count": int(r.count)} for r in results]
 
 def get_total_revenue(db: Session, store_id: uuid.UUID = None):
-    query = db.query(func.sum(Order.total_price)).filter(Order.status == "completed")
+    query = db.query(func.sum(Hourly.revenue))
     if store_id:
-        query = query.filter(Order.store_id == store_id)
-    return query.scalar() or 0.0
+        query = query.filter(Hourly.store_id == store_id)
+    return query.scalar() or ZERO
 
 def get_total_orders(db: Session, store_id: uuid.UUID = None): # Not used in API currently?
-    query = db.query(func.count(Order.id)).filter(Order.status == "completed")
+    query = db.query(func.sum(Hourly.order_count))
     if store_id:
-        query = query.filter(Order.store_id == store_id)
-    return query.scalar() or 0
+        query = query.filter(Hourly.store_id == store_id)
+    return int(query.scalar() or 0)
 
 def get_daily_revenue(db: Session, store_id: uuid.UUID = None):
     today = datetime.now().date() 
-    query = db.query(func.sum(Order.total_price))\
-        .filter(Order.status == "completed")\
-        .filter(func.date(Order.created_at) == today)
+    query = db.query(func.sum(Hourly.revenue))\
+        .filter(Hourly.day == today)
     
     if store_id:
-        query = query.filter(Order.store_id == store_id)
+        query = query.filter(Hourly.store_id == store_id)
         
-    return query.scalar() or 0.0
+    return query.scalar() or ZERO
 
 def get_daily_order_count(db: Session, store_id: uuid.UUID = None):
     today = datetime.now().date()
-    query = db.query(func.count(Order.id))\
-        .filter(Order.status == "completed")\
-        .filter(func.date(Order.created_at) == today)
+    query = db.query(func.sum(Hourly.order_count))\
+        .filter(Hourly.day == today)
         
     if store_id:
-        query = query.filter(Order.store_id == store_id)
+        query = query.filter(Hourly.store_id == store_id)
         
-    return query.scalar() or 0
+    return int(query.scalar() or 0)
 
 def get_hourly_sales(db: Session, store_id: uuid.UUID = None):
     """
@@ -66,50 +69,82 @@ def get_hourly_sales(db: Session, store_id: uuid.UUID = None):
     """
     today = datetime.now().date()
     query = db.query(
-        func.extract('hour', Order.created_at).label('hour'),
-        func.sum(Order.total_price).label('revenue'),
-        func.count(Order.id).label('count')
-    ).filter(Order.status == "completed")\
-     .filter(func.date(Order.created_at) == today)
+        Hourly.hour,
+        func.sum(Hourly.revenue).label('revenue'),
+        func.sum(Hourly.order_count).label('count')
+    ).filter(Hourly.day == today)
      
     if store_id:
-        query = query.filter(Order.store_id == store_id)
+        query = query.filter(Hourly.store_id == store_id)
 
-    results = query.group_by(func.extract('hour', Order.created_at))\
-     .order_by(func.extract('hour', Order.created_at))\
+    results = query.group_by(Hourly.hour)\
+     .having(func.sum(Hourly.order_count) > 0)\
+     .order_by(Hourly.hour)\
      .all()
      
-    return [{"hour": int(r.hour), "revenue": r.revenue, "count": r.count} for r in results]
+    return [{"hour": int(r.hour), "revenue": r.revenue, "count": int(r.count)} for r in results]
 
-def get_top_products(db: Session, limit: int = 5, store_id: uuid.UUID = None):
+def product_leaderboard(store_id: uuid.UUID = None, start_date: date = None, end_date: date = None):
     """
-    Get top selling products by quantity.
+    Product sales over an inclusive day range, best sellers first, from the
+    per-store, per-day product rollup. Grouped by product_id; the name shown
+    is the product's current name.
     """
-    query = db.query(
-        OrderItem.product_name,
-        func.sum(OrderItem.quantity).label('total_quantity'),
-        func.sum(OrderItem.quantity * OrderItem.unit_price).label('total_revenue')
-    ).join(Order, Order.id == OrderItem.order_id)\
-     .filter(Order.status == "completed")
-     
+    quantity = func.sum(ProductDaily.quantity)
+    stmt = select(
+        ProductDaily.product_id,
+        Product.name.label('name'),
+        quantity.label('total_quantity'),
+        func.sum(ProductDaily.revenue).label('total_revenue')
+    ).join(Product, Product.id == ProductDaily.product_id)
+
     if store_id:
-        query = query.filter(Order.store_id == store_id)
+        stmt = stmt.where(ProductDaily.store_id == store_id)
+    if start_date:
+        stmt = stmt.where(ProductDaily.day >= start_date)
+    if end_date:
+        stmt = stmt.where(ProductDaily.day <= end_date)
 
-    results = query.group_by(OrderItem.product_name)\
-     .order_by(desc('total_quantity'))\
-     .limit(limit)\
-     .all()
-     
+    return stmt.group_by(ProductDaily.product_id, Product.name)\
+        .having(quantity > 0)\
+        .order_by(desc(quantity), Product.name)
 
+def get_product_sales(db: Session, store_id: uuid.UUID = None, start_date: date = None,
+                      end_date: date = None, limit: int = None):
+    stmt = product_leaderboard(store_id, start_date, end_date)
+    if limit:
+        stmt = stmt.limit(limit)
     return [
         {
-            "name": r.product_name,
+            "product_id": r.product_id,
+            "name": r.name,
             "quantity": int(r.total_quantity or 0),
-            "revenue": float(r.total_revenue or 0)
+            "revenue": r.total_revenue or ZERO
         }
-        for r in results
+        for r in db.execute(stmt)
     ]
 
+def get_top_products(db: Session, limit: int = 5, store_id: uuid.UUID = None):
+    """
+    Get top selling products by quantity.
+    """
+    return get_product_sales(db, store_id=store_id, limit=limit)
+
+def get_archived_sales(db: Session, store_id: uuid.UUID = None, start_date: date = None, end_date: date = None):
+    """
+    (order_count, revenue) of archived completed orders over an inclusive
+    day range, for merging with live totals from the orders table.
+    """
+    query = db.query(func.sum(ArchivedDailySales.order_count), func.sum(ArchivedDailySales.revenue))
+    if store_id:
+        query = query.filter(ArchivedDailySales.store_id == store_id)
+    if start_date:
+        query = query.filter(ArchivedDailySales.day >= start_date)
+    if end_date:
+        query = query.filter(ArchivedDailySales.day <= end_date)
+    count, revenue = query.first()
+    return int(count or 0), revenue or ZERO
+
 def get_stores_overview(db: Session, start_date: date = None, end_date: date = None):
     """
     Get overview of all stores (active/inactive) with their sales stats in the period.
@@ -118,20 +153,20 @@ def get_stores_overview(db: Session, start_date: date = None, end_date: date = N
     from sqlalchemy import and_
     
     # Base conditions for the join
-    join_conditions = [Store.id == Order.store_id, Order.status == "completed"]
+    join_conditions = [Store.id == Hourly.store_id]
     
     if start_date:
-        join_conditions.append(func.date(Order.created_at) >= start_date)
+        join_conditions.append(Hourly.day >= start_date)
     if end_date:
-        join_conditions.append(func.date(Order.created_at) <= end_date)
+        join_conditions.append(Hourly.day <= end_date)
         
     query = db.query(
         Store.id,
         Store.name,
         Store.is_active,
-        func.count(Order.id).label('total_orders'),
-        func.sum(Order.total_price).label('total_revenue')
-    ).outerjoin(Order, and_(*join_conditions))\
+        func.sum(Hourly.order_count).label('total_orders'),
+        func.sum(Hourly.revenue).label('total_revenue')
+    ).outerjoin(Hourly, and_(*join_conditions))\
      .group_by(Store.id, Store.name, Store.is_active)\
      .order_by(Store.name)
      
@@ -142,9 +177,76 @@ def get_stores_overview(db: Session, start_date: date = None, end_date: date = N
             "store_id": r.id,
             "store_name": r.name,
             "is_active": r.is_active,
-            "total_orders": r.total_orders or 0,
-            "total_sales": float(r.total_revenue or 0)
+            "total_orders": int(r.total_orders or 0),
+            "total_sales": r.total_revenue or ZERO
         }
         for r in results
     ]
 
+def get_dashboard(db: Session, store_id: uuid.UUID = None, days: int = 30, top_limit: int = 5):
+    """
+    Everything the admin dashboard shows (today's stats, all-time revenue,
+    daily trend, today's hourly trend, top products) in a single round trip.
+    """
+    today = datetime.now().date()
+    start_date = today - timedelta(days=days)
+
+    def rows(kind, day, hour, name, revenue, count, model, *filters):
+        stmt = select(
+            literal(kind).label("kind"),
+            day.label("day"),
+            hour.label("hour"),
+            name.label("name"),
+            revenue.label("revenue"),
+            count.label("count")
+        ).where(*filters)
+        if store_id:
+            stmt = stmt.where(model.store_id == store_id)
+        return stmt
+
+    no_day, no_hour, no_name = cast(null(), Date), cast(null(), Integer), cast(null(), String)
+
+    total = rows("total", no_day, no_hour, no_name,
+                 func.sum(Hourly.revenue), func.sum(Hourly.order_count), Hourly)
+    daily = rows("day", Hourly.day, no_hour, no_name,
+                 func.sum(Hourly.revenue), func.sum(Hourly.order_count), Hourly,
+                 Hourly.day >= start_date)\
+        .group_by(Hourly.day)\
+        .having(func.sum(Hourly.order_count) > 0)
+    hourly = rows("hour", no_day, Hourly.hour, no_name,
+                  func.sum(Hourly.revenue), func.sum(Hourly.order_count), Hourly,
+                  Hourly.day == today)\
+        .group_by(Hourly.hour)\
+        .having(func.sum(Hourly.order_count) > 0)
+    top = product_leaderboard(store_id).limit(top_limit).subquery()
+    top = select(
+        literal("product").label("kind"), no_day.label("day"), no_hour.label("hour"),
+        top.c.name, top.c.total_revenue.label("revenue"), top.c.total_quantity.label("count")
+    )
+
+    stmt = union_all(total, daily, hourly, top)
+
+    result = {"total_revenue": ZERO, "daily_trend": [], "hourly": [], "top_products": []}
+    for r in db.execute(stmt):
+        if r.kind == "total":
+            result["total_revenue"] = r.revenue or ZERO
+        elif r.kind == "day":
+            result["daily_trend"].append({"date": str(r.day), "revenue": r.revenue, "count": int(r.count)})
+        elif r.kind == "hour":
+            result["hourly"].append({"hour": int(r.hour), "revenue": r.revenue, "count": int(r.count)})
+        else:
+            result["top_products"].append({"name": r.name, "quantity": int(r.count), "revenue": r.revenue or ZERO})
+
+    result["daily_trend"].sort(key=lambda d: d["date"])
+    result["hourly"].sort(key=lambda h: h["hour"])
+    result["top_products"].sort(key=lambda p: (-p["quantity"], p["name"]))
+
+    today_revenue = sum((h["revenue"] for h in result["hourly"]), ZERO)
+    today_orders = sum(h["count"] for h in result["hourly"])
+    result["stats"] = {
+        "today_revenue": today_revenue,
+        "today_orders": today_orders,
+        "today_aov": (today_revenue / today_orders).quantize(CENT) if today_orders > 0 else ZERO,
+        "total_revenue": result.pop("total_revenue")
+    }
+    return result
@@ -0,0 +1,226 @@
+import os
+import shutil
+import logging
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import select, delete, func, text
+from sqlalchemy.orm import Session, selectinload
+from app.core.config import settings
+from app.db import partitions
+from app.crud import prep_board
+from app.models.order import Order, OrderItem, OrderItemOption, OrderIdempotencyKey
+from app.models.analytics import ArchivedDailySales, UNASSIGNED_STORE_ID
+from app.models.archive import OrderArchive
+from app.models.types import ZERO
+
+logger = logging.getLogger(__name__)
+
+# Cold archive: whole months of orders / items / options move to zstd Parquet
+# files under ORDER_ARCHIVE_DIR/YYYY-MM/ and are dropped from the hot tables.
+# What stays in Postgres is a manifest row per month (order_archives), the
+# month's per-store daily totals (archived_daily_sales, read by GET /sales/stats)
+# and the sales rollups, which are never pruned.
+
+MONEY = pa.decimal128(18, 2)
+
+SCHEMAS = {
+    "orders": pa.schema([
+        ("id", pa.string()),
+        ("store_id", pa.string()),
+        ("created_at", pa.timestamp("us")),
+        ("status", pa.string()),
+        ("order_type", pa.string()),
+        ("table_number", pa.string()),
+        ("total_price", MONEY),
+    ]),
+    "order_items": pa.schema([
+        ("id", pa.string()),
+        ("order_id", pa.string()),
+        ("order_created_at", pa.timestamp("us")),
+        ("product_id", pa.string()),
+        ("product_name", pa.string()),
+        ("quantity", pa.int32()),
+        ("unit_price", MONEY),
+    ]),
+    "order_item_options": pa.schema([
+        ("id", pa.string()),
+        ("order_item_id", pa.string()),
+        ("order_created_at", pa.timestamp("us")),
+        ("option_name", pa.string()),
+        ("price_delta", MONEY),
+    ]),
+}
+
+MODELS = {"orders": Order, "order_items": OrderItem, "order_item_options": OrderItemOption}
+
+def _partition_key(model):
+    return model.created_at if model is Order else model.order_created_at
+
+def archive_cutoff(after_months: int = None) -> date:
+    """First month that is still too recent to archive."""
+    if after_months is None:
+        after_months = settings.ORDER_ARCHIVE_AFTER_MONTHS
+    current = partitions.month_start((datetime.utcnow() + timedelta(hours=8)).date())
+    return partitions.add_months(current, -after_months)
+
+def archivable_months(db: Session, after_months: int = None) -> List[date]:
+    """Months before the cutoff that still have orders and are not archived yet, oldest first."""
+    cutoff = archive_cutoff(after_months)
+    oldest = db.query(func.min(Order.created_at)).filter(Order.created_at < cutoff).scalar()
+    if oldest is None:
+        return []
+    archived = set(db.execute(select(OrderArchive.month)).scalars().all())
+    months = []
+    month = partitions.month_start(oldest.date())
+    while month < cutoff:
+        next_month = partitions.add_months(month, 1)
+        if month not in archived and db.query(Order.id).filter(
+            Order.created_at >= month, Order.created_at < next_month
+        ).first():
+            months.append(month)
+        month = next_month
+    return months
+
+def _month_rows(db: Session, model, month: date, batch_size: int):
+    key = _partition_key(model)
+    columns = [getattr(model, name) for name in SCHEMAS[model.__tablename__].names]
+    stmt = select(*columns)\
+        .where(key >= month, key < partitions.add_months(month, 1))\
+        .order_by(key, model.id)\
+        .execution_options(yield_per=batch_size)
+    for batch in db.execute(stmt).partitions():
+        yield batch
+
+def _cell(value):
+    if value is None or isinstance(value, (str, int, datetime, Decimal)):
+        return value
+    return str(value)  # UUIDs
+
+def _write_table(db: Session, name: str, month: date, path: str, batch_size: int, on_batch=None) -> int:
+    schema = SCHEMAS[name]
+    written = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for batch in _month_rows(db, MODELS[name], month, batch_size):
+            columns = list(zip(*batch))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array([_cell(v) for v in col], type=field.type) for col, field in zip(columns, schema)],
+                schema=schema
+            ))
+            if on_batch:
+                on_batch(batch)
+            written += len(batch)
+    return written
+
+def _remove_month(db: Session, month: date):
+    """Delete the month from the hot tables: its partitions are dropped, stray rows deleted."""
+    lo, hi = month, partitions.add_months(month, 1)
+    db.execute(delete(OrderIdempotencyKey).where(
+        OrderIdempotencyKey.order_created_at >= lo, OrderIdempotencyKey.order_created_at < hi))
+
+    if partitions.is_partitioned(db):
+        # Rows of the month that landed in the default partitions
+        for table, key in reversed(partitions.PARTITIONED_TABLES):
+            db.execute(text(f"DELETE FROM {table}_default WHERE {key} >= :lo AND {key} < :hi"), {"lo": lo, "hi": hi})
+        if month in partitions.list_months(db):
+            partitions.drop_month(db, month)
+        return
+
+    for model in (OrderItemOption, OrderItem, Order):
+        key = _partition_key(model)
+        db.execute(delete(model).where(key >= lo, key < hi).execution_options(synchronize_session=False))
+
+def _unprep_month(db: Session, month: date):
+    """Take the month's orders that were never cooked off the prep board."""
+    orders = db.query(Order)\
+        .filter(Order.created_at >= month, Order.created_at < partitions.add_months(month, 1),
+                Order.status.in_(prep_board.PREP_STATUSES))\
+        .options(selectinload(Order.items).selectinload(OrderItem.selected_options))\
+        .all()
+    prep_board.apply_orders(db, orders, sign=-1)
+
+def archive_month(db: Session, month: date, archive_dir: str = None, batch_size: int = 5000) -> Optional[OrderArchive]:
+    """
+    Write one month of orders, items and options to Parquet, record its daily
+    totals and manifest row, then remove it from the hot tables, all in one
+    transaction. Rows are streamed in batches, so memory does not grow with
+    the size of the month. Returns the manifest row, or None if the month is empty.
+    """
+    month = partitions.month_start(month)
+    if month >= archive_cutoff(0):
+        raise ValueError(f"{month:%Y-%m} is not closed yet")
+    if db.get(OrderArchive, month):
+        raise ValueError(f"{month:%Y-%m} is already archived")
+
+    if partitions.is_partitioned(db):
+        # Block late inserts into the month (offline sync) while it is exported
+        attached = month in partitions.list_months(db)
+        tables = [partitions.partition_name(t, month) for t, _ in partitions.PARTITIONED_TABLES if attached]
+        tables += [f"{t}_default" for t, _ in partitions.PARTITIONED_TABLES]
+        db.execute(text(f"LOCK TABLE {', '.join(tables)} IN SHARE MODE"))
+
+    archive_dir = archive_dir or settings.ORDER_ARCHIVE_DIR
+    final_dir = os.path.join(archive_dir, f"{month:%Y-%m}")
+    tmp_dir = final_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    daily = {}
+    def add_orders(batch):
+        for row in batch:
+            if row.status != "completed":
+                continue
+            key = (row.store_id or UNASSIGNED_STORE_ID, row.created_at.date())
+            totals = daily.setdefault(key, [0, ZERO])
+            totals[0] += 1
+            totals[1] += row.total_price
+
+    try:
+        counts = {
+            name: _write_table(db, name, month, os.path.join(tmp_dir, f"{name}.parquet"), batch_size,
+                               add_orders if name == "orders" else None)
+            for name in SCHEMAS
+        }
+        if not counts["orders"]:
+            shutil.rmtree(tmp_dir)
+            db.rollback()
+            return None
+
+        # Read the files back before anything is deleted
+        for name, count in counts.items():
+            if pq.ParquetFile(os.path.join(tmp_dir, f"{name}.parquet")).metadata.num_rows != count:
+                raise RuntimeError(f"{name}.parquet for {month:%Y-%m} does not have {count} rows")
+        if os.path.exists(final_dir):
+            shutil.rmtree(final_dir)
+        os.replace(tmp_dir, final_dir)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        db.rollback()
+        raise
+
+    db.add_all([
+        ArchivedDailySales(store_id=store_id, day=day, order_count=count, revenue=revenue)
+        for (store_id, day), (count, revenue) in daily.items()
+    ])
+    manifest = OrderArchive(
+        month=month,
+        path=final_dir,
+        order_count=counts["orders"],
+        item_count=counts["order_items"],
+        option_count=counts["order_item_options"],
+        revenue=sum((v[1] for v in daily.values()), ZERO)
+    )
+    db.add(manifest)
+    db.flush()
+    _unprep_month(db, month)
+    _remove_month(db, month)
+    db.commit()
+    logger.info("Archived %s: %d orders to %s", f"{month:%Y-%m}", counts["orders"], final_dir)
+    return manifest
+
+def read_archived_orders(month: date, archive_dir: str = None) -> pa.Table:
+    """The archived orders of one month, e.g. for a tax export."""
+    archive_dir = archive_dir or settings.ORDER_ARCHIVE_DIR
+    return pq.read_table(os.path.join(archive_dir, f"{partitions.month_start(month):%Y-%m}", "orders.parquet"))
@@ -1,12 +1,41 @@
-from sqlalchemy.orm import Session
-from app.models.product import Category as CategoryModel
-from app.schemas.product import CategoryCreate
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import update, case
+from sqlalchemy.orm import Session, selectinload
+from app.core.menu_cache import menu_cache, MenuSnapshot
+from app.models.product import Category as CategoryModel, Product as ProductModel
+from app.schemas.product import CategoryCreate, Category as CategorySchema
+
+_menu_adapter = TypeAdapter(List[CategorySchema])
 
 def get_menu(db: Session):
     """
     獲取完整菜單，包含分類、產品及客製化選項
     """
-    return db.query(CategoryModel).filter(CategoryModel.is_deleted == False).order_by(CategoryModel.sort_order).all()
+    return db.query(CategoryModel)\
+        .filter(CategoryModel.is_deleted == False)\
+        .options(selectinload(CategoryModel.products).selectinload(ProductModel.options))\
+        .order_by(CategoryModel.sort_order)\
+        .all()
+
+def get_menu_snapshot(db: Session) -> MenuSnapshot:
+    """
+    Pre-encoded JSON of the full menu, rebuilt only after a menu write.
+    """
+    snapshot = menu_cache.get()
+    if snapshot:
+        return snapshot
+
+    with menu_cache.build_lock:
+        snapshot = menu_cache.get()
+        if snapshot:
+            return snapshot
+        return build_menu_snapshot(db)
+
+def build_menu_snapshot(db: Session) -> MenuSnapshot:
+    version = menu_cache.version
+    categories = _menu_adapter.validate_python(get_menu(db), from_attributes=True)
+    return menu_cache.store(version, _menu_adapter.dump_json(categories))
 
 def delete_category(db: Session, category_id: str):
     import uuid
@@ -14,6 +43,7 @@ def delete_category(db: Session, category_id: str):
     if db_cat:
         db_cat.is_deleted = True
         db.commit()
+        menu_cache.invalidate()
     return db_cat
 
 def create_category(db: Session, category_in: CategoryCreate):
@@ -31,20 +61,28 @@ def create_category(db: Session, category_in: CategoryCreate):
     )
     db.add(db_obj)
     db.commit()
+    menu_cache.invalidate()
     db.refresh(db_obj)
     return db_obj
 
 def reorder_categories(db: Session, order_mapping: dict):
     """
-    Update sort_order for multiple categories.
-    order_mapping: {category_id (str): new_sort_order (int)}
+    Update sort_order for multiple categories in a single UPDATE.
+    order_mapping: {category_id (uuid): new_sort_order (int)}
+    Returns the ids that did not match any category.
     """
-    for cat_id, new_order in order_mapping.items():
-        db_cat = db.query(CategoryModel).filter(CategoryModel.id == cat_id).first()
-        if db_cat:
-            db_cat.sort_order = new_order
+    if not order_mapping:
+        return []
+
+    stmt = update(CategoryModel)\
+        .where(CategoryModel.id.in_(order_mapping.keys()))\
+        .values(sort_order=case(order_mapping, value=CategoryModel.id))\
+        .returning(CategoryModel.id)\
+        .execution_options(synchronize_session=False)
+    updated = set(db.execute(stmt).scalars().all())
     db.commit()
-    return True
+    menu_cache.invalidate()
+    return [cat_id for cat_id in order_mapping if cat_id not in updated]
 
 def get_deleted_items(db: Session):
     """
@@ -65,6 +103,7 @@ def restore_category(db: Session, category_id: str):
     if db_cat:
         db_cat.is_deleted = False
         db.commit()
+        menu_cache.invalidate()
     return db_cat
 
 def hard_delete_category(db: Session, category_id: str):
@@ -78,4 +117,5 @@ def hard_delete_category(db: Session, category_id: str):
     if db_cat:
         db.delete(db_cat)
         db.commit()
+    menu_cache.invalidate()
     return True
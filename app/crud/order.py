@@ -1,103 +1,633 @@
 import uuid
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session, joinedload
-from app.models.order import Order, OrderItem, OrderItemOption
+import json
+import base64
+import hashlib
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import insert, select, update, delete, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+from app.models.order import Order, OrderItem, OrderItemOption, OrderIdempotencyKey
+from app.models.types import ZERO
+from app.models.analytics import UNASSIGNED_STORE_ID
 from app.models.product import Product, ProductOption
-from app.schemas.order import OrderCreate
+from app.schemas.order import (
+    OrderCreate, OrderResponse, OfflineOrderCreate, BulkOrderResult, OrderStatusTransition, BulkStatusResult
+)
+from app.core.config import settings
+from app.crud import rollup, prep_board
+from app.core.order_events import order_events
 from fastapi import HTTPException
 
-def create_order(db: Session, order_in: OrderCreate, store_id: uuid.UUID = None):
-    total_price = 0.0
-    db_order = Order(
-        id=uuid.uuid4(),
-        table_number=order_in.table_number,
-        total_price=0.0,
-        status="pending",
-        order_type=order_in.order_type,
-        created_at=datetime.utcnow() + timedelta(hours=8),
-        store_id=store_id
+# Order lifecycle: pending → preparing → ready → completed, or cancelled on the
+# way. Steps may be skipped (a pending order can be completed right away);
+# completed and cancelled are final.
+STATUS_TRANSITIONS = {
+    "pending": ("preparing", "ready", "completed", "cancelled"),
+    "preparing": ("ready", "completed", "cancelled"),
+    "ready": ("completed", "cancelled"),
+    "completed": (),
+    "cancelled": (),
+}
+# Shown on the kitchen display (partial index ix_orders_active)
+ACTIVE_STATUSES = ("pending", "preparing", "ready")
+
+def can_transition(current: str, status: str) -> bool:
+    return status in STATUS_TRANSITIONS.get(current, ())
+
+def _request_hash(order_in: OrderCreate) -> str:
+    # Only the OrderCreate fields, so an order POSTed directly and the same
+    # order later synced from the offline queue under its key hash the same
+    body = OrderCreate.model_validate(order_in.model_dump(include=set(OrderCreate.model_fields)))
+    return hashlib.sha256(body.model_dump_json().encode()).hexdigest()
+
+def _idempotency_cutoff() -> datetime:
+    """Idempotency keys stored before this have expired."""
+    return datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+def get_idempotent_replay(db: Session, store_id: uuid.UUID, key: str, request_hash: str) -> Optional[OrderResponse]:
+    """
+    The stored response of an earlier order sent with the same Idempotency-Key,
+    or None if the key is unknown or expired.
+    """
+    row = db.get(OrderIdempotencyKey, (store_id or UNASSIGNED_STORE_ID, key))
+    if not row:
+        return None
+    if row.created_at < _idempotency_cutoff():
+        db.delete(row)
+        db.flush()
+        return None
+    if row.request_hash != request_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different order")
+    return OrderResponse.model_validate_json(row.response)
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    result = db.execute(delete(OrderIdempotencyKey).where(OrderIdempotencyKey.created_at < _idempotency_cutoff()))
+    db.commit()
+    return result.rowcount
+
+def _order_response(order_row: dict, item_rows: list, option_rows: list) -> OrderResponse:
+    """
+    OrderResponse of a just-created order, built from the rows that were inserted.
+    """
+    options_by_item = {}
+    for opt in option_rows:
+        options_by_item.setdefault(opt["order_item_id"], []).append({
+            "option_name": opt["option_name"],
+            "price_delta": opt["price_delta"]
+        })
+    return OrderResponse(
+        id=order_row["id"],
+        store_id=order_row["store_id"],
+        table_number=order_row["table_number"],
+        order_type=order_row["order_type"],
+        total_price=order_row["total_price"],
+        status=order_row["status"],
+        created_at=order_row["created_at"],
+        items=[
+            {
+                "product_name": item["product_name"],
+                "quantity": item["quantity"],
+                "unit_price": item["unit_price"],
+                "selected_options": options_by_item.get(item["id"], [])
+            }
+            for item in item_rows
+        ]
     )
-    db.add(db_order)
+
+def _resolve_menu(db: Session, orders_in: list):
+    """
+    Every product and option referenced by the given orders, one IN (...) query each.
+    """
+    product_ids = {item.product_id for o in orders_in for item in o.items}
+    option_ids = {opt_id for o in orders_in for item in o.items for opt_id in item.option_ids}
+
+    products = {
+        p.id: p for p in db.query(Product).filter(Product.id.in_(product_ids)).all()
+    } if product_ids else {}
+    options = {
+        o.id: o for o in db.query(ProductOption).filter(ProductOption.id.in_(option_ids)).all()
+    } if option_ids else {}
+    return products, options
+
+def _price_order(order_in: OrderCreate, order_id: uuid.UUID, created_at: datetime, products: dict, options: dict):
+    """
+    Price one order against the resolved menu. Returns (total_price, item_rows, option_rows).
+    Item and option rows carry the order's created_at, their partition key.
+    """
+    total_price = ZERO
+    item_rows = []
+    option_rows = []
 
     for item in order_in.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
+        product = products.get(item.product_id)
         if not product:
             raise HTTPException(status_code=404, detail=f"Product {item.product_id} not found")
 
         current_unit_price = product.base_price
-        options_to_add = []
-        
+        item_id = uuid.uuid4()
+
         for opt_id in item.option_ids:
-            option = db.query(ProductOption).filter(ProductOption.id == opt_id).first()
-            if option:
-                current_unit_price += option.price_delta
-                options_to_add.append(option)
-
-        db_item = OrderItem(
-            id=uuid.uuid4(),
-            order_id=db_order.id,
-            product_id=product.id,
-            product_name=product.name,
-            quantity=item.quantity,
-            unit_price=current_unit_price
-        )
-        db.add(db_item)
-        
-        for opt in options_to_add:
-            db.add(OrderItemOption(
-                order_item_id=db_item.id,
-                option_name=opt.name,
-                price_delta=opt.price_delta
-            ))
-        
+            option = options.get(opt_id)
+            if not option or option.product_id != product.id:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Option {opt_id} does not belong to product {product.id}"
+                )
+            current_unit_price += option.price_delta
+            option_rows.append({
+                "id": uuid.uuid4(),
+                "order_item_id": item_id,
+                "order_created_at": created_at,
+                "option_name": option.name,
+                "price_delta": option.price_delta
+            })
+
+        item_rows.append({
+            "id": item_id,
+            "order_id": order_id,
+            "order_created_at": created_at,
+            "product_id": product.id,
+            "product_name": product.name,
+            "quantity": item.quantity,
+            "unit_price": current_unit_price
+        })
         total_price += current_unit_price * item.quantity
 
-    db_order.total_price = total_price
+    return total_price, item_rows, option_rows
+
+def _local_now() -> datetime:
+    # Orders are stored in naive UTC+8 (store local time)
+    return datetime.utcnow() + timedelta(hours=8)
+
+def create_order(db: Session, order_in: OrderCreate, store_id: uuid.UUID = None, idempotency_key: Optional[str] = None):
+    """
+    建立訂單
+    Products and options are resolved with one IN (...) lookup each and the
+    line items are bulk inserted, so query count does not grow with basket size.
+    With an idempotency_key, a retry of the same order returns the stored
+    response of the first attempt instead of creating a duplicate.
+    The response is built from the inserted rows, without reading them back.
+    """
+    if idempotency_key:
+        request_hash = _request_hash(order_in)
+        replay = get_idempotent_replay(db, store_id, idempotency_key, request_hash)
+        if replay:
+            return replay
+
+    products, options = _resolve_menu(db, [order_in])
+
+    order_id = uuid.uuid4()
+    created_at = _local_now()
+    total_price, item_rows, option_rows = _price_order(order_in, order_id, created_at, products, options)
+
+    order_row = {
+        "id": order_id,
+        "table_number": order_in.table_number,
+        "total_price": total_price,
+        "status": "pending",
+        "order_type": order_in.order_type,
+        "created_at": created_at,
+        "store_id": store_id
+    }
+    db.execute(insert(Order), [order_row])
+    if item_rows:
+        db.execute(insert(OrderItem), item_rows)
+    if option_rows:
+        db.execute(insert(OrderItemOption), option_rows)
+
+    prep_board.apply_new_orders(db, [order_row], item_rows, option_rows)
+
+    response = _order_response(order_row, item_rows, option_rows)
+    if idempotency_key:
+        db.add(OrderIdempotencyKey(
+            store_id=store_id or UNASSIGNED_STORE_ID,
+            key=idempotency_key,
+            order_id=order_id,
+            order_created_at=created_at,
+            request_hash=request_hash,
+            response=response.model_dump_json()
+        ))
+
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent retry with the same key won the race; replay its order
+        db.rollback()
+        replay = get_idempotent_replay(db, store_id, idempotency_key, request_hash) if idempotency_key else None
+        if replay:
+            return replay
+        raise
+    order_events.publish(store_id, "order_created", response.model_dump(mode="json"))
+    return response
+
+def _client_time(value: datetime) -> datetime:
+    """
+    Client timestamp in the naive UTC+8 convention used by Order.created_at.
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None) + timedelta(hours=8)
+    return value
+
+def create_orders_bulk(db: Session, orders_in: List[OfflineOrderCreate], store_id: uuid.UUID = None) -> List[BulkOrderResult]:
+    """
+    離線訂單批次同步
+    Prices every queued order against the menu in one pass and inserts the new
+    ones in a single transaction with multi-row inserts. Orders whose
+    idempotency key was already synced are reported as duplicates; expired
+    keys are dropped and their orders created again, as for a single order.
+    """
+    key_store_id = store_id or UNASSIGNED_STORE_ID
+    keys = {o.idempotency_key for o in orders_in}
+
+    if keys:
+        db.execute(delete(OrderIdempotencyKey).where(
+            OrderIdempotencyKey.store_id == key_store_id,
+            OrderIdempotencyKey.key.in_(keys),
+            OrderIdempotencyKey.created_at < _idempotency_cutoff()
+        ))
+    existing = {
+        row.key: row
+        for row in db.query(OrderIdempotencyKey).filter(
+            OrderIdempotencyKey.store_id == key_store_id,
+            OrderIdempotencyKey.key.in_(keys)
+        ).all()
+    } if keys else {}
+
+    products, options = _resolve_menu(db, orders_in)
+
+    results = []
+    seen = {}
+    order_rows, item_rows, option_rows, key_rows = [], [], [], []
+
+    for order_in in orders_in:
+        key = order_in.idempotency_key
+        request_hash = _request_hash(order_in)
+
+        previous = seen.get(key) or existing.get(key)
+        if previous is not None:
+            # Keys synced before the hash covered only the OrderCreate fields
+            # hashed the whole queued order; accept those until they expire
+            legacy_hash = hashlib.sha256(order_in.model_dump_json().encode()).hexdigest()
+            if previous.request_hash not in (request_hash, legacy_hash):
+                results.append(BulkOrderResult(idempotency_key=key, result="error",
+                                               error="Idempotency-Key was already used for a different order"))
+            else:
+                results.append(BulkOrderResult(idempotency_key=key, result="duplicate",
+                                               order=OrderResponse.model_validate_json(previous.response)))
+            continue
+
+        order_id = uuid.uuid4()
+        created_at = _client_time(order_in.client_created_at)
+        try:
+            total_price, items, opts = _price_order(order_in, order_id, created_at, products, options)
+        except HTTPException as e:
+            results.append(BulkOrderResult(idempotency_key=key, result="error", error=e.detail))
+            continue
+
+        order_row = {
+            "id": order_id,
+            "table_number": order_in.table_number,
+            "total_price": total_price,
+            "status": order_in.status,
+            "order_type": order_in.order_type,
+            "created_at": created_at,
+            "store_id": store_id
+        }
+        response = _order_response(order_row, items, opts)
+        key_row = {
+            "store_id": key_store_id,
+            "key": key,
+            "order_id": order_id,
+            "order_created_at": created_at,
+            "request_hash": request_hash,
+            "response": response.model_dump_json(),
+            "created_at": datetime.utcnow()
+        }
+
+        order_rows.append(order_row)
+        item_rows.extend(items)
+        option_rows.extend(opts)
+        key_rows.append(key_row)
+        seen[key] = OrderIdempotencyKey(**key_row)
+        results.append(BulkOrderResult(idempotency_key=key, result="created", order=response))
+
+    if order_rows:
+        db.execute(insert(Order), order_rows)
+        if item_rows:
+            db.execute(insert(OrderItem), item_rows)
+        if option_rows:
+            db.execute(insert(OrderItemOption), option_rows)
+        db.execute(insert(OrderIdempotencyKey), key_rows)
+        rollup.apply_new_orders(db, [o for o in order_rows if o["status"] == "completed"], item_rows)
+        prep_board.apply_new_orders(db, order_rows, item_rows, option_rows)
     db.commit()
-    db.refresh(db_order)
-    return db_order
+
+    for r in results:
+        if r.result == "created" and r.order.status in ACTIVE_STATUSES:
+            order_events.publish(r.order.store_id, "order_created", r.order.model_dump(mode="json"))
+    return results
 
 def get_active_orders(db: Session, store_id: uuid.UUID = None):
     """
-    列出目前尚未完成的訂單 (status == 'pending')
+    列出目前尚未完成的訂單 (pending / preparing / ready)
     """
-    query = db.query(Order).filter(Order.status == "pending")
+    query = db.query(Order).filter(Order.status.in_(ACTIVE_STATUSES))
     
     if store_id:
         query = query.filter(Order.store_id == store_id)
         
-    return query.options(joinedload(Order.items))\
+    return query.options(selectinload(Order.items).selectinload(OrderItem.selected_options))\
         .order_by(Order.created_at.asc())\
         .all()
 
-def get_orders(db: Session, skip: int = 0, limit: int = 100, store_id: uuid.UUID = None):
+def encode_cursor(created_at: datetime, order_id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor pointing just past (created_at, id).
+    """
+    raw = json.dumps({"t": created_at.isoformat(), "id": str(order_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["t"]), uuid.UUID(data["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def get_orders(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    store_id: uuid.UUID = None,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
     """
     列出資料庫中所有的訂單 (包含已完成的)
+    Newest first, paginated by keyset on (created_at, id) via `cursor`;
+    `skip` is the deprecated offset mode. `start`/`end` are a half-open range.
     """
     query = db.query(Order)
     
     if store_id:
         query = query.filter(Order.store_id == store_id)
-        
-    return query.options(joinedload(Order.items))\
-        .order_by(Order.created_at.desc())\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    if status:
+        query = query.filter(Order.status == status)
+    if start:
+        query = query.filter(Order.created_at >= start)
+    if end:
+        query = query.filter(Order.created_at < end)
+    if cursor:
+        created_at, order_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id))
 
-def update_order_status(db: Session, order_id: uuid.UUID, status: str):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    query = query.options(selectinload(Order.items).selectinload(OrderItem.selected_options))\
+        .order_by(Order.created_at.desc(), Order.id.desc())
+
+    if skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+EXPORT_COLUMNS = [
+    "order_id", "store_id", "created_at", "status", "order_type", "table_number", "total_price",
+    "item_id", "product_id", "product_name", "quantity", "unit_price",
+    "option_name", "price_delta",
+]
+
+def iter_export_rows(
+    db: Session,
+    store_id: uuid.UUID = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: int = 1000
+):
+    """
+    Yield one flat row per order / item / option, ordered by order then item,
+    using a server-side cursor so memory stays flat for any date range.
+    """
+    stmt = select(
+        Order.id.label("order_id"),
+        Order.store_id,
+        Order.created_at,
+        Order.status,
+        Order.order_type,
+        Order.table_number,
+        Order.total_price,
+        OrderItem.id.label("item_id"),
+        OrderItem.product_id,
+        OrderItem.product_name,
+        OrderItem.quantity,
+        OrderItem.unit_price,
+        OrderItemOption.option_name,
+        OrderItemOption.price_delta
+    ).outerjoin(OrderItem, (OrderItem.order_id == Order.id) & (OrderItem.order_created_at == Order.created_at))\
+     .outerjoin(OrderItemOption, (OrderItemOption.order_item_id == OrderItem.id)
+                & (OrderItemOption.order_created_at == OrderItem.order_created_at))
+
+    if store_id:
+        stmt = stmt.where(Order.store_id == store_id)
+    if start:
+        stmt = stmt.where(Order.created_at >= start)
+    if end:
+        stmt = stmt.where(Order.created_at < end)
+
+    stmt = stmt.order_by(Order.created_at, Order.id, OrderItem.id)\
+        .execution_options(stream_results=True, yield_per=batch_size)
+
+    for row in db.execute(stmt):
+        yield row
+
+def iter_export_orders(db: Session, **filters):
+    """
+    Same as iter_export_rows, but folds the rows back into one nested dict per order.
+    """
+    current = None
+    current_item = None
+    for row in iter_export_rows(db, **filters):
+        if current is None or current["id"] != row.order_id:
+            if current is not None:
+                yield current
+            current = {
+                "id": row.order_id,
+                "store_id": row.store_id,
+                "created_at": row.created_at,
+                "status": row.status,
+                "order_type": row.order_type,
+                "table_number": row.table_number,
+                "total_price": row.total_price,
+                "items": []
+            }
+            current_item = None
+        if row.item_id is None:
+            continue
+        if current_item is None or current_item["id"] != row.item_id:
+            current_item = {
+                "id": row.item_id,
+                "product_id": row.product_id,
+                "product_name": row.product_name,
+                "quantity": row.quantity,
+                "unit_price": row.unit_price,
+                "selected_options": []
+            }
+            current["items"].append(current_item)
+        if row.option_name is not None:
+            current_item["selected_options"].append({
+                "option_name": row.option_name,
+                "price_delta": row.price_delta
+            })
+    if current is not None:
+        yield current
+
+def _locked_order(db: Session, order_id: uuid.UUID, store_id: uuid.UUID = None) -> Optional[Order]:
+    # Lock the row so concurrent status changes cannot double-count the rollups.
+    # Items and options come along in two IN (...) queries for the response.
+    query = db.query(Order)\
+        .options(selectinload(Order.items).selectinload(OrderItem.selected_options))\
+        .filter(Order.id == order_id)
+    if store_id:
+        query = query.filter(Order.store_id == store_id)
+    return query.with_for_update().first()
+
+def update_order_status(db: Session, order_id: uuid.UUID, status: str, version: int = None,
+                        store_id: uuid.UUID = None) -> Optional[OrderResponse]:
+    """
+    Move one order to `status`. With `version`, the order must still be at that
+    version, i.e. unchanged since the client read it; otherwise 409.
+    With store_id, another store's order is treated as not found.
+    """
+    order = _locked_order(db, order_id, store_id)
     if not order:
         return None
+    if version is not None and order.version != version:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Order was changed by someone else (now {order.status}, version {order.version})"
+        )
+    if not can_transition(order.status, status):
+        raise HTTPException(status_code=409, detail=f"Cannot change order status from {order.status} to {status}")
+    if status == "completed":
+        rollup.apply_order(db, order)
+    prep_board.apply_status_change(db, order, status)
     order.status = status
+    order.version += 1
+    # Serialize before commit; commit expires the instance and reading it
+    # afterwards would reload the order and each item's options
+    response = OrderResponse.model_validate(order)
+    db.commit()
+    order_events.publish(response.store_id, "order_updated",
+                         {"id": str(response.id), "status": response.status, "version": response.version})
+    return response
+
+def _status_change_rows(db: Session, order_keys: list, with_options: bool):
+    """
+    Items (and options) of the given (order_id, created_at) keys, as plain rows
+    for the rollups and the prep board. Two queries whatever the number of orders.
+    """
+    item_rows = [dict(r) for r in db.execute(
+        select(OrderItem.id, OrderItem.order_id, OrderItem.product_id, OrderItem.product_name,
+               OrderItem.quantity, OrderItem.unit_price)
+        .where(tuple_(OrderItem.order_id, OrderItem.order_created_at).in_(order_keys))
+    ).mappings()]
+    option_rows = []
+    if with_options:
+        option_rows = [dict(r) for r in db.execute(
+            select(OrderItemOption.order_item_id, OrderItemOption.option_name)
+            .join(OrderItem, (OrderItem.id == OrderItemOption.order_item_id)
+                  & (OrderItem.order_created_at == OrderItemOption.order_created_at))
+            .where(tuple_(OrderItem.order_id, OrderItem.order_created_at).in_(order_keys))
+        ).mappings()]
+    return item_rows, option_rows
+
+def transition_orders(db: Session, transitions: List[OrderStatusTransition], status: str,
+                      store_id: uuid.UUID = None) -> List[BulkStatusResult]:
+    """
+    Move many orders to `status` with one conditional
+    UPDATE ... WHERE (id, status, version) IN (...) RETURNING. An order is only
+    updated while it still has the status and version the client sent, so a
+    change made meanwhile by another screen comes back as a conflict (with the
+    current status and version) instead of being overwritten. Rollups and the
+    prep board are adjusted from the returned rows, with a constant number of
+    statements for the whole batch. Returns one result per order id, in request
+    order (the last entry wins for a repeated id). With store_id, orders of
+    other stores are reported as not found.
+    """
+    latest = {t.id: t for t in transitions}
+    expected = {}
+    results = {}
+    for t in latest.values():
+        if can_transition(t.status, status):
+            expected[t.id] = t
+        else:
+            results[t.id] = BulkStatusResult(
+                id=t.id, result="invalid", status=t.status, version=t.version,
+                error=f"Cannot change order status from {t.status} to {status}"
+            )
+
+    updated = []
+    if expected:
+        stmt = update(Order)\
+            .where(tuple_(Order.id, Order.status, Order.version).in_(
+                [(t.id, t.status, t.version) for t in expected.values()]))\
+            .values(status=status, version=Order.version + 1)\
+            .returning(Order.id, Order.store_id, Order.created_at, Order.total_price, Order.version)\
+            .execution_options(synchronize_session=False)
+        if store_id:
+            stmt = stmt.where(Order.store_id == store_id)
+        updated = db.execute(stmt).all()
+
+    # Rows as they were before the update, for the rollups and the prep board
+    order_rows = [
+        {"id": r.id, "store_id": r.store_id, "created_at": r.created_at,
+         "total_price": r.total_price, "status": expected[r.id].status}
+        for r in updated
+    ]
+    completed = order_rows if status == "completed" else []
+    left_prep = [] if status in prep_board.PREP_STATUSES else \
+        [o for o in order_rows if o["status"] in prep_board.PREP_STATUSES]
+    if completed or left_prep:
+        item_rows, option_rows = _status_change_rows(
+            db, [(o["id"], o["created_at"]) for o in completed or left_prep], with_options=bool(left_prep))
+        rollup.apply_new_orders(db, completed, item_rows)
+        prep_board.apply_rows(db, left_prep, item_rows, option_rows, sign=-1)
+
+    for r in updated:
+        results[r.id] = BulkStatusResult(id=r.id, result="updated", status=status, version=r.version)
+
+    missing = [order_id for order_id in expected if order_id not in results]
+    if missing:
+        query = select(Order.id, Order.status, Order.version).where(Order.id.in_(missing))
+        if store_id:
+            query = query.where(Order.store_id == store_id)
+        for r in db.execute(query):
+            results[r.id] = BulkStatusResult(
+                id=r.id, result="conflict", status=r.status, version=r.version,
+                error="Order was changed by someone else"
+            )
+        for order_id in missing:
+            results.setdefault(order_id, BulkStatusResult(id=order_id, result="not_found"))
     db.commit()
-    db.refresh(order)
-    return order
 
-def delete_order(db: Session, order_id: uuid.UUID):
-    order = db.query(Order).filter(Order.id == order_id).first()
+    for r in updated:
+        order_events.publish(r.store_id, "order_updated", {"id": str(r.id), "status": status, "version": r.version})
+    return [results[order_id] for order_id in latest]
+
+def delete_order(db: Session, order_id: uuid.UUID, store_id: uuid.UUID = None) -> Optional[OrderResponse]:
+    """
+    With store_id, another store's order is treated as not found.
+    """
+    order = _locked_order(db, order_id, store_id)
     if not order:
         return None
+    if order.status == "completed":
+        rollup.apply_order(db, order, sign=-1)
+    elif order.status in prep_board.PREP_STATUSES:
+        prep_board.apply_order(db, order, sign=-1)
+    response = OrderResponse.model_validate(order)
     db.delete(order)
     db.commit()
-    return order
+    order_events.publish(response.store_id, "order_deleted", {"id": str(order_id)})
+    return response
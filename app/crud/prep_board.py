@@ -0,0 +1,111 @@
+import uuid
+from typing import List
+from sqlalchemy import select, delete, func
+from sqlalchemy.orm import Session, selectinload
+from app.models.kitchen import PrepCount
+from app.models.order import Order, OrderItem
+from app.models.analytics import UNASSIGNED_STORE_ID
+from app.crud.rollup import upsert
+
+# Orders in these statuses still have to be cooked
+PREP_STATUSES = ("pending", "preparing")
+
+def options_key(option_names) -> str:
+    # Sorted by code point; the migration backfill sorts with COLLATE "C" to match
+    return ", ".join(sorted(option_names))
+
+def _apply(db: Session, lines: list, sign: int):
+    """lines: (store_id, product_id, product_name, options, quantity)"""
+    counts = {}
+    for store_id, product_id, product_name, options, quantity in lines:
+        row = counts.setdefault((store_id or UNASSIGNED_STORE_ID, product_id, options), [product_name, 0])
+        row[0] = product_name
+        row[1] += quantity
+    upsert(db, PrepCount, [
+        {"store_id": k[0], "product_id": k[1], "options": k[2], "product_name": v[0], "quantity": sign * v[1]}
+        for k, v in counts.items()
+    ], ["quantity"], replace_columns=("product_name",))
+
+def apply_rows(db: Session, order_rows: list, item_rows: list, option_rows: list, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) the items of a batch of orders, from plain
+    rows: orders need id and store_id, items id, order_id, product_id,
+    product_name and quantity, options order_item_id and option_name. Items of
+    orders not in order_rows are skipped. One upsert per batch; the caller commits.
+    """
+    stores = {o["id"]: o["store_id"] for o in order_rows}
+    if not stores:
+        return
+    options = {}
+    for opt in option_rows:
+        options.setdefault(opt["order_item_id"], []).append(opt["option_name"])
+    _apply(db, [
+        (stores[item["order_id"]], item["product_id"], item["product_name"],
+         options_key(options.get(item["id"], [])), item["quantity"])
+        for item in item_rows if item["order_id"] in stores
+    ], sign)
+
+def apply_new_orders(db: Session, order_rows: list, item_rows: list, option_rows: list):
+    """
+    Add the items of just-inserted orders that still have to be cooked, from
+    the rows being inserted.
+    """
+    apply_rows(db, [o for o in order_rows if o["status"] in PREP_STATUSES], item_rows, option_rows)
+
+def _order_lines(order: Order) -> list:
+    return [
+        (order.store_id, item.product_id, item.product_name,
+         options_key(o.option_name for o in item.selected_options), item.quantity)
+        for item in order.items
+    ]
+
+def apply_order(db: Session, order: Order, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) an order's items, from its loaded items
+    and options. Runs inside the caller's transaction.
+    """
+    _apply(db, _order_lines(order), sign)
+
+def apply_orders(db: Session, orders: List[Order], sign: int = 1):
+    """Same as apply_order for several orders, in one upsert."""
+    _apply(db, [line for order in orders for line in _order_lines(order)], sign)
+
+def apply_status_change(db: Session, order: Order, new_status: str):
+    was, now = order.status in PREP_STATUSES, new_status in PREP_STATUSES
+    if now and not was:
+        apply_order(db, order)
+    elif was and not now:
+        apply_order(db, order, sign=-1)
+
+def get_board(db: Session, store_id: uuid.UUID = None) -> List[dict]:
+    """
+    Units to make per product + options, largest first. Without store_id the
+    counts of every store are added up.
+    """
+    quantity = func.sum(PrepCount.quantity)
+    stmt = select(
+        PrepCount.product_id,
+        func.max(PrepCount.product_name).label("product_name"),
+        PrepCount.options,
+        quantity.label("quantity")
+    ).where(PrepCount.quantity > 0)
+    if store_id:
+        stmt = stmt.where(PrepCount.store_id == store_id)
+    stmt = stmt.group_by(PrepCount.product_id, PrepCount.options)\
+        .order_by(quantity.desc(), func.max(PrepCount.product_name), PrepCount.options)
+    return [
+        {"product_id": r.product_id, "product_name": r.product_name, "options": r.options, "quantity": int(r.quantity)}
+        for r in db.execute(stmt)
+    ]
+
+def rebuild(db: Session):
+    """
+    Recompute the board from the orders still to be cooked.
+    """
+    orders = db.query(Order)\
+        .filter(Order.status.in_(PREP_STATUSES))\
+        .options(selectinload(Order.items).selectinload(OrderItem.selected_options))\
+        .all()
+    db.execute(delete(PrepCount))
+    apply_orders(db, orders)
+    db.commit()
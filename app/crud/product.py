@@ -1,6 +1,8 @@
+from sqlalchemy import update, case
 from sqlalchemy.orm import Session
 from app.models.product import Product, ProductOption
 from app.schemas.product import ProductUpdate, ProductCreate
+from app.core.menu_cache import menu_cache
 import uuid
 
 def get_product_by_name(db: Session, name: str):
@@ -35,20 +37,28 @@ def create_product(db: Session, product_in: ProductCreate):
         db.add(new_opt)
         
     db.commit()
+    menu_cache.invalidate()
     db.refresh(db_product)
     return db_product
 
 def reorder_products(db: Session, order_mapping: dict):
     """
-    Update sort_order for multiple products.
-    order_mapping: {product_id (str): new_sort_order (int)}
+    Update sort_order for multiple products in a single UPDATE.
+    order_mapping: {product_id (uuid): new_sort_order (int)}
+    Returns the ids that did not match any product.
     """
-    for prod_id, new_order in order_mapping.items():
-        db_prod = db.query(Product).filter(Product.id == prod_id).first()
-        if db_prod:
-            db_prod.sort_order = new_order
+    if not order_mapping:
+        return []
+
+    stmt = update(Product)\
+        .where(Product.id.in_(order_mapping.keys()))\
+        .values(sort_order=case(order_mapping, value=Product.id))\
+        .returning(Product.id)\
+        .execution_options(synchronize_session=False)
+    updated = set(db.execute(stmt).scalars().all())
     db.commit()
-    return True
+    menu_cache.invalidate()
+    return [prod_id for prod_id in order_mapping if prod_id not in updated]
 
 def update_product_by_name(db: Session, db_product: Product, product_in: ProductUpdate):
     update_data = product_in.model_dump(exclude_unset=True)
@@ -78,6 +88,7 @@ def update_product_by_name(db: Session, db_product: Product, product_in: Product
     
     db.add(db_product)
     db.commit()
+    menu_cache.invalidate()
     db.refresh(db_product)
     return db_product
     return db_product
@@ -88,6 +99,7 @@ def delete_product(db: Session, product_id: str):
     if db_prod:
         db_prod.is_deleted = True
         db.commit()
+        menu_cache.invalidate()
     return db_prod
     return db_prod
 
@@ -97,6 +109,7 @@ def restore_product(db: Session, product_id: str):
     if db_prod:
         db_prod.is_deleted = False
         db.commit()
+        menu_cache.invalidate()
     return db_prod
 
 def hard_delete_product(db: Session, product_id: str):
@@ -105,4 +118,5 @@ def hard_delete_product(db: Session, product_id: str):
     if db_prod:
         db.delete(db_prod)
         db.commit()
+        menu_cache.invalidate()
     return True
@@ -0,0 +1,202 @@
+import uuid
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, delete, insert, literal, and_, or_, not_, false, Integer, UUID
+from app.models.order import Order, OrderItem
+from app.models.analytics import SalesHourlyRollup, ProductDailyRollup, ArchivedDailySales, UNASSIGNED_STORE_ID
+from app.models.archive import OrderArchive
+from app.models.kitchen import PrepCount
+from app.models.types import ZERO
+from app.db.partitions import add_months
+
+def upsert(db: Session, model, rows: list, value_columns: list, replace_columns: tuple = ()):
+    """
+    INSERT rows, adding value_columns onto any existing row with the same key
+    and overwriting replace_columns.
+    Rows are written in primary key order: Postgres locks conflicting rows in
+    VALUES order, so concurrent upserts touching the same rows in different
+    orders would deadlock.
+    """
+    if not rows:
+        return
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+
+    key = [c.name for c in model.__table__.primary_key.columns]
+    rows = sorted(rows, key=lambda r: tuple(r[k] for k in key))
+    stmt = dialect_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=key,
+        set_={
+            **{col: getattr(model, col) + getattr(stmt.excluded, col) for col in value_columns},
+            **{col: getattr(stmt.excluded, col) for col in replace_columns},
+        }
+    )
+    db.execute(stmt)
+
+def apply_order(db: Session, order: Order, sign: int = 1):
+    """
+    Add (sign=1) or remove (sign=-1) a completed order from the rollups.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    store_id = order.store_id or UNASSIGNED_STORE_ID
+    day = order.created_at.date()
+
+    upsert(db, SalesHourlyRollup, [{
+        "store_id": store_id,
+        "day": day,
+        "hour": order.created_at.hour,
+        "order_count": sign,
+        "revenue": sign * order.total_price
+    }], ["order_count", "revenue"])
+
+    # Grouped from order.items, which callers load along with the locked order
+    products = {}
+    for item in order.items:
+        row = products.setdefault(item.product_id, [item.product_name, 0, ZERO])
+        row[1] += item.quantity
+        row[2] += item.quantity * item.unit_price
+
+    upsert(db, ProductDailyRollup, [
+        {
+            "store_id": store_id,
+            "day": day,
+            "product_id": product_id,
+            "product_name": name,
+            "quantity": sign * quantity,
+            "revenue": sign * revenue
+        }
+        for product_id, (name, quantity, revenue) in products.items()
+    ], ["quantity", "revenue"], replace_columns=("product_name",))
+
+def apply_new_orders(db: Session, order_rows: list, item_rows: list):
+    """
+    Add a batch of completed orders to the rollups from the rows being inserted,
+    aggregated in memory so the whole batch costs one upsert per rollup table.
+    Runs inside the caller's transaction; the caller commits.
+    """
+    hourly = {}
+    orders = {}
+    for o in order_rows:
+        store_id = o["store_id"] or UNASSIGNED_STORE_ID
+        day = o["created_at"].date()
+        orders[o["id"]] = (store_id, day)
+        row = hourly.setdefault((store_id, day, o["created_at"].hour), [0, ZERO])
+        row[0] += 1
+        row[1] += o["total_price"]
+
+    products = {}
+    for item in item_rows:
+        if item["order_id"] not in orders:
+            continue
+        store_id, day = orders[item["order_id"]]
+        row = products.setdefault((store_id, day, item["product_id"]), [item["product_name"], 0, ZERO])
+        row[1] += item["quantity"]
+        row[2] += item["quantity"] * item["unit_price"]
+
+    upsert(db, SalesHourlyRollup, [
+        {"store_id": k[0], "day": k[1], "hour": k[2], "order_count": v[0], "revenue": v[1]}
+        for k, v in hourly.items()
+    ], ["order_count", "revenue"])
+    upsert(db, ProductDailyRollup, [
+        {"store_id": k[0], "day": k[1], "product_id": k[2], "product_name": v[0], "quantity": v[1], "revenue": v[2]}
+        for k, v in products.items()
+    ], ["quantity", "revenue"], replace_columns=("product_name",))
+
+def reassign_store(db: Session, store_id: uuid.UUID):
+    """
+    Move a store's rollups and kitchen prep counts to the unassigned bucket
+    (used when the store is deleted and its orders lose their store_id).
+    Runs inside the caller's transaction.
+    """
+    for model, value_columns in (
+        (SalesHourlyRollup, ["order_count", "revenue"]),
+        (ProductDailyRollup, ["quantity", "revenue"]),
+        (ArchivedDailySales, ["order_count", "revenue"]),
+        (PrepCount, ["quantity"]),
+    ):
+        rows = [
+            {**{c.name: getattr(r, c.name) for c in model.__table__.columns}, "store_id": UNASSIGNED_STORE_ID}
+            for r in db.query(model).filter(model.store_id == store_id).all()
+        ]
+        db.query(model).filter(model.store_id == store_id).delete(synchronize_session=False)
+        upsert(db, model, rows, value_columns)
+
+def _rollup_keys():
+    store_id = func.coalesce(Order.store_id, literal(UNASSIGNED_STORE_ID, UUID))
+    return store_id, func.date(Order.created_at)
+
+def _in_archived_months(db: Session, column):
+    """
+    Condition matching `column` inside a month moved to the cold archive.
+    Those months are no longer in the orders table, so rebuilds keep their rollups.
+    """
+    months = db.execute(select(OrderArchive.month)).scalars().all()
+    if not months:
+        return false()
+    return or_(*(and_(column >= m, column < add_months(m, 1)) for m in months))
+
+def rebuild_hourly(db: Session):
+    """
+    Recompute sales_hourly_rollups from the raw orders table, except for
+    archived months. Runs inside the caller's transaction.
+    """
+    store_id, day = _rollup_keys()
+    hour = func.extract("hour", Order.created_at).cast(Integer)
+
+    db.execute(delete(SalesHourlyRollup).where(not_(_in_archived_months(db, SalesHourlyRollup.day))))
+    db.execute(insert(SalesHourlyRollup).from_select(
+        ["store_id", "day", "hour", "order_count", "revenue"],
+        select(
+            store_id,
+            day,
+            hour,
+            func.count(Order.id),
+            func.sum(Order.total_price)
+        ).where(Order.status == "completed", not_(_in_archived_months(db, Order.created_at)))
+         .group_by(store_id, day, hour)
+    ))
+
+def rebuild_products(db: Session):
+    """
+    Recompute the per-store, per-day product leaderboard (product_daily_rollups)
+    from order_items, except for archived months. Every row of a product gets
+    the name of its most recent order item, i.e. its latest name.
+    Runs inside the caller's transaction.
+    """
+    store_id, day = _rollup_keys()
+
+    ranked = select(
+        OrderItem.product_id,
+        OrderItem.product_name,
+        func.row_number().over(
+            partition_by=OrderItem.product_id,
+            order_by=(OrderItem.order_created_at.desc(), OrderItem.id.desc())
+        ).label("rank")
+    ).subquery()
+    latest = select(ranked.c.product_id, ranked.c.product_name).where(ranked.c.rank == 1).subquery()
+
+    db.execute(delete(ProductDailyRollup).where(not_(_in_archived_months(db, ProductDailyRollup.day))))
+    db.execute(insert(ProductDailyRollup).from_select(
+        ["store_id", "day", "product_id", "product_name", "quantity", "revenue"],
+        select(
+            store_id,
+            day,
+            OrderItem.product_id,
+            latest.c.product_name,
+            func.sum(OrderItem.quantity),
+            func.sum(OrderItem.quantity * OrderItem.unit_price)
+        ).join(Order, (Order.id == OrderItem.order_id) & (Order.created_at == OrderItem.order_created_at))
+         .join(latest, latest.c.product_id == OrderItem.product_id)
+         .where(Order.status == "completed", not_(_in_archived_months(db, Order.created_at)))
+         .group_by(store_id, day, OrderItem.product_id, latest.c.product_name)
+    ))
+
+def rebuild(db: Session):
+    """
+    Recompute every rollup row from the raw orders / order_items tables.
+    """
+    rebuild_hourly(db)
+    rebuild_products(db)
+    db.commit()
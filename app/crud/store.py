@@ -5,6 +5,8 @@ from app.models.store import Store
 from app.models.order import Order
 from app.schemas.store import StoreCreate, StoreUpdate
 from app.core.security import get_password_hash
+from app.crud import rollup
+from app.core.store_cache import store_cache, CachedStore
 
 def get_store(db: Session, store_id: uuid.UUID):
     return db.query(Store).filter(Store.id == store_id).first()
@@ -32,6 +34,10 @@ def update_store(db: Session, db_obj: Store, obj_in: StoreUpdate):
         hashed_password = get_password_hash(update_data["password"])
         del update_data["password"]
         update_data["password_hash"] = hashed_password
+        # A new password or deactivation revokes every token issued so far
+        update_data["token_version"] = db_obj.token_version + 1
+    elif update_data.get("is_active") is False and db_obj.is_active:
+        update_data["token_version"] = db_obj.token_version + 1
         
     for field in update_data:
         setattr(db_obj, field, update_data[field])
@@ -39,6 +45,7 @@ def update_store(db: Session, db_obj: Store, obj_in: StoreUpdate):
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    store_cache.put(CachedStore.from_model(db_obj))
     return db_obj
 
 def delete_store(db: Session, store_id: uuid.UUID):
@@ -53,9 +60,12 @@ def delete_store(db: Session, store_id: uuid.UUID):
     # Set store_id to NULL for related orders to avoid FK violation
     # This keeps the order history but disassociates it from the deleted store
     db.query(Order).filter(Order.store_id == store_id).update({Order.store_id: None})
+    rollup.reassign_store(db, store_id)
     
+    name = store.name
     db.delete(store)
     db.commit()
+    store_cache.put(CachedStore(id=store_id, name=name, is_active=False))
     return store
 
 def reset_password(db: Session, store_id: uuid.UUID, new_password: str):
@@ -64,6 +74,8 @@ def reset_password(db: Session, store_id: uuid.UUID, new_password: str):
         return None
         
     store.password_hash = get_password_hash(new_password)
+    store.token_version += 1
     db.commit()
     db.refresh(store)
+    store_cache.put(CachedStore.from_model(store))
     return store
@@ -1,4 +1,7 @@
 # app/db/base.py
 from app.models.base import Base
 from app.models.product import Category, Product, ProductOption
-from app.models.order import Order, OrderItem, OrderItemOption
\ No newline at end of file
+from app.models.order import Order, OrderItem, OrderItemOption, OrderIdempotencyKey
+from app.models.analytics import SalesHourlyRollup, ProductDailyRollup, ArchivedDailySales
+from app.models.archive import OrderArchive
+from app.models.kitchen import PrepCount
@@ -0,0 +1,139 @@
+# app/db/partitions.py
+import logging
+from datetime import date, datetime, timedelta
+from typing import List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Monthly range partitioned tables and their partition key, parent first.
+# order_items / order_item_options are partitioned by their order's created_at,
+# so one month of orders and everything hanging off it share partition bounds
+# and can be detached or dropped together.
+PARTITIONED_TABLES = (
+    ("orders", "created_at"),
+    ("order_items", "order_created_at"),
+    ("order_item_options", "order_created_at"),
+)
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+def add_months(d: date, months: int) -> date:
+    m = d.year * 12 + d.month - 1 + months
+    return date(m // 12, m % 12 + 1, 1)
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def is_partitioned(db: Session) -> bool:
+    """True on Postgres once the orders table is partitioned (migration 5c8e2f7a9d31)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('orders'))"
+    )).scalar())
+
+def list_months(db: Session) -> List[date]:
+    """First day of every month with an attached orders partition, oldest first."""
+    if not is_partitioned(db):
+        return []
+    names = db.execute(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = 'orders'::regclass"
+    )).scalars().all()
+    return sorted(
+        datetime.strptime(n[len("orders_p"):], "%Y%m").date()
+        for n in names if n.startswith("orders_p")
+    )
+
+def _default_has_rows(db: Session, month: date) -> bool:
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM orders_default WHERE created_at >= :lo AND created_at < :hi)"
+    ), {"lo": month, "hi": add_months(month, 1)}).scalar())
+
+def ensure_partitions(db: Session, months_ahead: int = None) -> List[str]:
+    """
+    Create the monthly partitions of every partitioned table from the current
+    month through `months_ahead` months from now. Idempotent; returns the names
+    of the tables created. No-op on SQLite.
+
+    Rows outside every monthly partition land in the *_default partitions. A
+    month whose rows are already in orders_default is skipped with a warning,
+    since Postgres cannot attach a partition over rows held by the default one.
+    """
+    if not is_partitioned(db):
+        return []
+    if months_ahead is None:
+        months_ahead = settings.ORDER_PARTITION_MONTHS_AHEAD
+
+    # Orders are stamped in naive UTC+8 (store local time)
+    current = month_start((datetime.utcnow() + timedelta(hours=8)).date())
+    existing = set(list_months(db))
+    created = []
+    for i in range(months_ahead + 1):
+        month = add_months(current, i)
+        if month in existing:
+            continue
+        if _default_has_rows(db, month):
+            logger.warning("orders_default holds rows for %s; not creating its partitions", f"{month:%Y-%m}")
+            continue
+        for table, _ in PARTITIONED_TABLES:
+            name = partition_name(table, month)
+            db.execute(text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            ))
+            created.append(name)
+    db.commit()
+    return created
+
+def _detach(db: Session, month: date) -> List[str]:
+    if not is_partitioned(db):
+        raise ValueError("orders is not partitioned on this database")
+    month = month_start(month)
+    if month not in list_months(db):
+        raise ValueError(f"No attached partition for {month:%Y-%m}")
+
+    # Expired long before a month is old enough to detach, but they would block it
+    db.execute(text(
+        "DELETE FROM order_idempotency_keys WHERE order_created_at >= :lo AND order_created_at < :hi"
+    ), {"lo": month, "hi": add_months(month, 1)})
+
+    detached = []
+    # Children first, so the parent partition is no longer referenced
+    for table, _ in reversed(PARTITIONED_TABLES):
+        name = partition_name(table, month)
+        db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+        fks = db.execute(text(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(:name) AND contype = 'f' "
+            "AND confrelid IN ('orders'::regclass, 'order_items'::regclass)"
+        ), {"name": name}).scalars().all()
+        for fk in fks:
+            db.execute(text(f'ALTER TABLE {name} DROP CONSTRAINT "{fk}"'))
+        detached.append(name)
+    return detached
+
+def detach_month(db: Session, month: date) -> List[str]:
+    """
+    Detach one month of orders, items and options from the partitioned tables
+    (metadata only, no rows are rewritten). The detached tables keep their data
+    as standalone tables, without the foreign keys to the partitioned parents.
+    Returns the names of the detached tables. Rollups are not touched, so
+    analytics keep the month's totals.
+    """
+    detached = _detach(db, month)
+    db.commit()
+    return detached
+
+def drop_month(db: Session, month: date) -> List[str]:
+    """
+    Detach and drop one month of orders, items and options. Returns the dropped table names.
+    """
+    dropped = _detach(db, month)
+    for name in dropped:
+        db.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    return dropped
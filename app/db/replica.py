@@ -0,0 +1,86 @@
+# app/db/replica.py
+import time
+import logging
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds since the replica last replayed a transaction, or 0 when it has
+# replayed everything it received (an idle primary sends nothing to replay).
+# 0 on a server that is not in recovery, e.g. when the "replica" is the primary.
+LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+class ReplicaLag:
+    """
+    Replication lag of the read replica, measured at most every `check_interval`
+    seconds. Reads go to the primary while the replica is more than
+    `max_staleness` seconds behind, or when the lag cannot be measured.
+    With no max_staleness (or no separate replica) every read may use the replica.
+    """
+
+    def __init__(self, engine: Optional[Engine], async_engine: Optional[AsyncEngine],
+                 max_staleness: Optional[float], check_interval: float):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.max_staleness = max_staleness
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self._checked_at = float("-inf")
+
+    @property
+    def enabled(self) -> bool:
+        return (
+            self.max_staleness is not None
+            and self.engine is not None
+            and self.engine.dialect.name == "postgresql"
+        )
+
+    def _due(self) -> bool:
+        return time.monotonic() - self._checked_at >= self.check_interval
+
+    def _record(self, lag: Optional[float]) -> bool:
+        was_fresh = self._checked_at == float("-inf") or self.fresh
+        self.lag = lag
+        self._checked_at = time.monotonic()
+        if was_fresh and not self.fresh:
+            logger.warning("Read replica lag %s s exceeds %s s, reading from the primary", lag, self.max_staleness)
+        return self.fresh
+
+    @property
+    def fresh(self) -> bool:
+        return self.lag is not None and self.lag <= self.max_staleness
+
+    def is_fresh(self) -> bool:
+        if not self.enabled:
+            return True
+        if not self._due():
+            return self.fresh
+        try:
+            with self.engine.connect() as conn:
+                lag = float(conn.execute(LAG_SQL).scalar())
+        except Exception:
+            logger.exception("Could not measure read replica lag")
+            lag = None
+        return self._record(lag)
+
+    async def is_fresh_async(self) -> bool:
+        if not self.enabled:
+            return True
+        if not self._due():
+            return self.fresh
+        try:
+            async with self.async_engine.connect() as conn:
+                lag = float((await conn.execute(LAG_SQL)).scalar())
+        except Exception:
+            logger.exception("Could not measure read replica lag")
+            lag = None
+        return self._record(lag)
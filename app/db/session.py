@@ -1,15 +1,101 @@
 # app/db/session.py
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_engine
+from app.db.replica import ReplicaLag
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+def _async_url(url: str) -> str:
+    u = make_url(url)
+    if u.get_backend_name() == "postgresql":
+        return u.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if u.get_backend_name() == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    return url
+
+def _engine_options(url: str, is_async: bool, read_only: bool = False) -> dict:
+    u = make_url(url)
+    if u.get_backend_name() != "postgresql":
+        return {}
+
+    server_settings = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    if is_async:
+        connect_args = {"server_settings": server_settings}
+    else:
+        connect_args = {"options": " ".join(f"-c {k}={v}" for k, v in server_settings.items())}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "connect_args": connect_args,
+    }
+
+engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True, **_engine_options(settings.DATABASE_URL, False))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, pool_pre_ping=True, **_engine_options(ASYNC_DATABASE_URL, True))
+
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=True)
+
+# Read replica for analytics, sales reports and exports; without
+# REPLICA_DATABASE_URL the read sessions share the primary's engines.
+if settings.REPLICA_DATABASE_URL:
+    replica_engine = create_engine(
+        settings.REPLICA_DATABASE_URL, pool_pre_ping=True,
+        **_engine_options(settings.REPLICA_DATABASE_URL, False, read_only=True)
+    )
+    ASYNC_REPLICA_DATABASE_URL = _async_url(settings.REPLICA_DATABASE_URL)
+    async_replica_engine = create_async_engine(
+        ASYNC_REPLICA_DATABASE_URL, pool_pre_ping=True,
+        **_engine_options(ASYNC_REPLICA_DATABASE_URL, True, read_only=True)
+    )
+    instrument_engine(replica_engine)
+    instrument_engine(async_replica_engine.sync_engine)
+    replica_lag = ReplicaLag(replica_engine, async_replica_engine,
+                             settings.REPLICA_MAX_STALENESS_SECONDS, settings.REPLICA_LAG_CHECK_SECONDS)
+else:
+    replica_engine = engine
+    async_replica_engine = async_engine
+    replica_lag = ReplicaLag(None, None, None, settings.REPLICA_LAG_CHECK_SECONDS)
+
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+AsyncReadSessionLocal = async_sessionmaker(async_replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=True)
+
+def read_sessionmaker():
+    """Session factory for read-only reporting queries: the replica unless it is too far behind."""
+    return ReadSessionLocal if replica_lag.is_fresh() else SessionLocal
+
+async def async_read_sessionmaker():
+    return AsyncReadSessionLocal if await replica_lag.is_fresh_async() else AsyncSessionLocal
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_read_db():
+    db = read_sessionmaker()()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db():
+    async with (await async_read_sessionmaker())() as db:
+        yield db
@@ -1,9 +1,36 @@
 # app/main.py
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from app.core.metrics import metrics, MetricsMiddleware
+from app.db.session import SessionLocal
+from app.db.partitions import ensure_partitions
 from app.api.v1.endpoints import menu, orders, products, analytics, sales, login, stores
 
-app = FastAPI(title="Turkey Rice POS System", version="1.0.0")
+logger = logging.getLogger(__name__)
+
+def _ensure_order_partitions():
+    db = SessionLocal()
+    try:
+        created = ensure_partitions(db)
+        if created:
+            logger.info("Created order partitions: %s", ", ".join(created))
+    except Exception:
+        # Orders still land in the default partitions; the cron job retries
+        logger.exception("Could not create order partitions")
+        db.rollback()
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await run_in_threadpool(_ensure_order_partitions)
+    yield
+
+app = FastAPI(title="Turkey Rice POS System", version="1.0.0", lifespan=lifespan)
 
 # CROS
 app.add_middleware(
@@ -12,8 +39,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Server-Timing"],
 )
 
+# Per-route latency / query count / DB time, see GET /metrics
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(stores.router, prefix="/api/v1/stores", tags=["Stores"])
 app.include_router(login.router, prefix="/api/v1", tags=["Login"])
 app.include_router(menu.router, prefix="/api/v1/menu", tags=["Menu"])
@@ -24,4 +55,9 @@ app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytic
 
 @app.get("/")
 def root():
-    return {"message": "Welcome to Turkey Rice POS API"}
\ No newline at end of file
+    return {"message": "Welcome to Turkey Rice POS API"}
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Prometheus text exposition of the per-route request metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
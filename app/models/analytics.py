@@ -0,0 +1,55 @@
+# app/models/analytics.py
+
+import uuid
+from decimal import Decimal
+from datetime import date
+from sqlalchemy import String, Integer, Date, UUID, Index, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+from app.models.types import Money
+
+# Rollup rows for orders that have no store (e.g. the store was deleted)
+UNASSIGNED_STORE_ID = uuid.UUID(int=0)
+
+class SalesHourlyRollup(Base):
+    """已完成訂單的每小時營業額彙總"""
+    __tablename__ = "sales_hourly_rollups"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    hour: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Money, default=0, nullable=False)
+
+    # All-store queries filter on day alone
+    __table_args__ = (Index("ix_sales_hourly_rollups_day", "day"),)
+
+class ProductDailyRollup(Base):
+    """已完成訂單的每日品項銷量彙總"""
+    __tablename__ = "product_daily_rollups"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Keyed by product so a rename does not split its stats
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("products.id"), primary_key=True)
+    # Name on the most recent order counted, for reference; readers show products.name
+    product_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Money, default=0, nullable=False)
+
+    __table_args__ = (Index("ix_product_daily_rollups_day", "day"),)
+
+class ArchivedDailySales(Base):
+    """
+    已封存訂單的每日彙總 (completed orders, like GET /sales/stats counts them).
+    Written when a month is moved to the cold archive (app/crud/archive.py),
+    so sales stats still cover it after its rows leave the orders table.
+    """
+    __tablename__ = "archived_daily_sales"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    order_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Money, default=0, nullable=False)
+
+    __table_args__ = (Index("ix_archived_daily_sales_day", "day"),)
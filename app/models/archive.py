@@ -0,0 +1,21 @@
+# app/models/archive.py
+
+from decimal import Decimal
+from datetime import date, datetime
+from sqlalchemy import String, Integer, Date, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+from app.models.types import Money
+
+class OrderArchive(Base):
+    """封存紀錄: one row per month of orders moved to the Parquet archive"""
+    __tablename__ = "order_archives"
+
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Directory holding orders / order_items / order_item_options .parquet
+    path: Mapped[str] = mapped_column(String(500), nullable=False)
+    order_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    item_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    option_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    revenue: Mapped[Decimal] = mapped_column(Money, nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
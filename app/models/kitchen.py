@@ -0,0 +1,22 @@
+# app/models/kitchen.py
+
+import uuid
+from sqlalchemy import String, Integer, UUID, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+class PrepCount(Base):
+    """
+    廚房備餐看板: units still to make per product + option combination,
+    summed over a store's pending and preparing orders. Kept up to date by
+    app/crud/prep_board.py in the same transaction as each order change.
+    """
+    __tablename__ = "kitchen_prep_counts"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+    product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("products.id"), primary_key=True)
+    # Selected option names, sorted and joined with ", " ("" for none)
+    options: Mapped[str] = mapped_column(String(200), primary_key=True, default="")
+    product_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Rows are not deleted when this drops to 0; readers skip them
+    quantity: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
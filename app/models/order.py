@@ -1,46 +1,105 @@
 # app/models/order.py
 
 import uuid
+from decimal import Decimal
 from typing import List, Optional
 from datetime import datetime
-from sqlalchemy import ForeignKey, String, Float, DateTime, Integer, UUID
+from sqlalchemy import DDL, event, ForeignKey, ForeignKeyConstraint, String, DateTime, Integer, UUID, Index, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
+from app.models.types import Money
 from app.models.store import Store
 
 class Order(Base):
+    """
+    訂單
+    On Postgres, orders / order_items / order_item_options are range partitioned
+    by month on the order's created_at (see app/db/partitions.py), so the
+    partition key is part of every primary and foreign key.
+    """
     __tablename__ = "orders"
     
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
     table_number: Mapped[Optional[str]] = mapped_column(String(10)) 
-    total_price: Mapped[float] = mapped_column(Float, nullable=False)
+    total_price: Mapped[Decimal] = mapped_column(Money, nullable=False)
     status: Mapped[str] = mapped_column(String(20), default="pending") 
+    # Bumped on every status change; clients send back the version they saw
+    # so a change made meanwhile by another screen is detected, not overwritten
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
     order_type: Mapped[str] = mapped_column(String(20), default="dine_in")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+    created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=datetime.now)
     store_id: Mapped[Optional[uuid.UUID]] = mapped_column(ForeignKey("stores.id"), nullable=True)
     
     items: Mapped[List["OrderItem"]] = relationship(back_populates="order", cascade="all, delete-orphan")
     store: Mapped["Store"] = relationship()
 
+    __table_args__ = (
+        Index("ix_orders_store_status_created", "store_id", "status", "created_at"),
+        Index("ix_orders_created_at", "created_at"),
+        Index("ix_orders_store_created_id", "store_id", "created_at", "id"),
+        Index("ix_orders_active", "store_id", "created_at",
+              postgresql_where=text("status IN ('pending', 'preparing', 'ready')")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
 class OrderItem(Base):
     """訂單明細"""
     __tablename__ = "order_items"
     
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
-    order_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("orders.id"), nullable=False)
+    order_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False)
+    # Copy of orders.created_at, the partition key
+    order_created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
     product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("products.id"), nullable=False)
     product_name: Mapped[str] = mapped_column(String(100), nullable=False) 
     quantity: Mapped[int] = mapped_column(Integer, default=1)
-    unit_price: Mapped[float] = mapped_column(Float, nullable=False) 
+    unit_price: Mapped[Decimal] = mapped_column(Money, nullable=False) 
     
     order: Mapped["Order"] = relationship(back_populates="items")
     selected_options: Mapped[List["OrderItemOption"]] = relationship(cascade="all, delete-orphan")
 
+    __table_args__ = (
+        ForeignKeyConstraint(["order_id", "order_created_at"], ["orders.id", "orders.created_at"]),
+        Index("ix_order_items_order_id", "order_id", "order_created_at"),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
+    )
+
 class OrderItemOption(Base):
     """客製化紀錄"""
     __tablename__ = "order_item_options"
     
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
-    order_item_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("order_items.id"), nullable=False)
+    order_item_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False)
+    order_created_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
     option_name: Mapped[str] = mapped_column(String(50), nullable=False) 
-    price_delta: Mapped[float] = mapped_column(Float, nullable=False)
\ No newline at end of file
+    price_delta: Mapped[Decimal] = mapped_column(Money, nullable=False)
+
+    __table_args__ = (
+        ForeignKeyConstraint(["order_item_id", "order_created_at"], ["order_items.id", "order_items.order_created_at"]),
+        Index("ix_order_item_options_order_item_id", "order_item_id", "order_created_at"),
+        {"postgresql_partition_by": "RANGE (order_created_at)"},
+    )
+
+class OrderIdempotencyKey(Base):
+    """送單重試保護 (Idempotency-Key)"""
+    __tablename__ = "order_idempotency_keys"
+
+    store_id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True)
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    order_id: Mapped[uuid.UUID] = mapped_column(UUID, nullable=False)
+    order_created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    request_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    response: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(["order_id", "order_created_at"], ["orders.id", "orders.created_at"], ondelete="CASCADE"),
+        Index("ix_order_idempotency_keys_order_id", "order_id", "order_created_at"),
+    )
+
+# A fresh create_all() database on Postgres gets a catch-all partition per
+# table, so orders can be written before ensure_partitions() adds the months
+for _table in (Order.__table__, OrderItem.__table__, OrderItemOption.__table__):
+    event.listen(_table, "after_create", DDL(
+        f"CREATE TABLE {_table.name}_default PARTITION OF {_table.name} DEFAULT"
+    ).execute_if(dialect="postgresql"))
@@ -1,10 +1,12 @@
 # app/models/product.py
 
 import uuid
+from decimal import Decimal
 from typing import List
-from sqlalchemy import ForeignKey, String, Float, Integer, Boolean, UUID
+from sqlalchemy import ForeignKey, String, Integer, Boolean, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.models.base import Base
+from app.models.types import Money
 
 class Category(Base):
     """菜單分類"""
@@ -30,7 +32,7 @@ class Product(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
     category_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("categories.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    base_price: Mapped[float] = mapped_column(Float, nullable=False)
+    base_price: Mapped[Decimal] = mapped_column(Money, nullable=False)
     sort_order: Mapped[int] = mapped_column(Integer, default=0)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
     
@@ -44,7 +46,7 @@ class ProductOption(Base):
     id: Mapped[uuid.UUID] = mapped_column(UUID, primary_key=True, default=uuid.uuid4)
     product_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("products.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
-    price_delta: Mapped[float] = mapped_column(Float, default=0.0)
+    price_delta: Mapped[Decimal] = mapped_column(Money, default=0)
     is_required: Mapped[bool] = mapped_column(Boolean, default=False)
     is_deleted: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -0,0 +1,35 @@
+# app/models/types.py
+
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+# Amounts are stored in minor units (1/100 of the currency unit)
+MINOR_UNITS = 100
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+def to_money(value) -> Decimal:
+    """Exact Decimal amount rounded to the cent. Floats go through str() so 45.1 stays 45.10."""
+    if isinstance(value, float):
+        value = str(value)
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+class Money(TypeDecorator):
+    """
+    金額欄位: BIGINT minor units in the database, exact Decimal in Python.
+    SUMs in SQL are integer sums, so totals never drift.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return int(to_money(value) * MINOR_UNITS)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        # Postgres returns SUM(bigint) as numeric
+        return Decimal(int(value)).scaleb(-2)
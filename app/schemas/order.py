@@ -1,8 +1,8 @@
 # app/schemas/order.py
 import uuid
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 class OrderItemOptionSchema(BaseModel):
     option_name: str
@@ -26,8 +26,13 @@ class OrderCreate(BaseModel):
     order_type: str = "dine_in"
     items: List[OrderItemCreate]
 
+# pending → preparing → ready → completed / cancelled (see app/crud/order.py)
+OrderStatus = Literal["pending", "preparing", "ready", "completed", "cancelled"]
+
 class OrderUpdateStatus(BaseModel):
-    status: str
+    status: OrderStatus
+    # The version the client last saw; if the order changed since, 409
+    version: Optional[int] = None
 
 class OrderResponse(BaseModel):
     id: uuid.UUID
@@ -36,6 +41,56 @@ class OrderResponse(BaseModel):
     order_type: str
     total_price: float
     status: str
+    version: int = 1
     created_at: datetime
     items: List[OrderItemSchema]
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class OfflineOrderCreate(OrderCreate):
+    """
+    An order queued by the POS while offline, synced later through /orders/bulk.
+    """
+    idempotency_key: str = Field(min_length=1, max_length=64)
+    client_created_at: datetime
+    status: Literal["pending", "completed"] = "pending"
+
+class BulkOrderCreate(BaseModel):
+    orders: List[OfflineOrderCreate] = Field(max_length=500)
+
+class BulkOrderResult(BaseModel):
+    idempotency_key: str
+    result: Literal["created", "duplicate", "error"]
+    order: Optional[OrderResponse] = None
+    error: Optional[str] = None
+
+class BulkOrderResponse(BaseModel):
+    results: List[BulkOrderResult]
+
+class OrderStatusTransition(BaseModel):
+    """
+    One order of a bulk status change, with the status and version the client last saw.
+    """
+    id: uuid.UUID
+    status: OrderStatus
+    version: int
+
+class BulkStatusUpdate(BaseModel):
+    status: OrderStatus
+    orders: List[OrderStatusTransition] = Field(min_length=1, max_length=500)
+
+class BulkStatusResult(BaseModel):
+    id: uuid.UUID
+    result: Literal["updated", "conflict", "invalid", "not_found"]
+    # Current status and version: the new ones when updated, the server's on a conflict
+    status: Optional[str] = None
+    version: Optional[int] = None
+    error: Optional[str] = None
+
+class BulkStatusResponse(BaseModel):
+    results: List[BulkStatusResult]
+
+class PrepBoardLine(BaseModel):
+    product_id: uuid.UUID
+    product_name: str
+    options: str
+    quantity: int
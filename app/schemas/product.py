@@ -2,7 +2,7 @@
 
 import uuid
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 class ProductOptionBase(BaseModel):
     name: str
@@ -54,5 +54,20 @@ class Category(CategoryBase):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ReorderItem(BaseModel):
+    id: uuid.UUID
+    sort_order: int = Field(ge=0)
+
 class ReorderSchema(BaseModel):
-    items: List[dict] # [{"id": "uuid", "sort_order": 1}, ...]
\ No newline at end of file
+    items: List[ReorderItem] # [{"id": "uuid", "sort_order": 1}, ...]
+
+    @field_validator("items")
+    @classmethod
+    def check_unique_ids(cls, items: List[ReorderItem]):
+        ids = [item.id for item in items]
+        if len(ids) != len(set(ids)):
+            raise ValueError("Duplicate id in reorder items")
+        return items
+
+    def to_mapping(self) -> dict:
+        return {item.id: item.sort_order for item in self.items}
@@ -36,15 +36,11 @@ const Admin: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                // Fetch daily trend instead of hourly trend
-                const [statsRes, trendRes, productsRes] = await Promise.all([
-                    axios.get(`${API_BASE}/analytics/stats`),
-                    axios.get(`${API_BASE}/analytics/daily-trend`), // Updated endpoint
-                    axios.get(`${API_BASE}/analytics/top-products`)
-                ]);
-                setStats(statsRes.data);
-                setDailyTrend(trendRes.data);
-                setTopProducts(productsRes.data);
+                // Stats, daily trend and top products in one request
+                const res = await axios.get(`${API_BASE}/analytics/dashboard`);
+                setStats(res.data.stats);
+                setDailyTrend(res.data.daily_trend);
+                setTopProducts(res.data.top_products);
             } catch (err) {
                 console.error("Failed to fetch admin data", err);
             } finally {
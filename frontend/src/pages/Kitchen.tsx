@@ -2,11 +2,27 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
 import { CheckCircle2, Trash2, Clock, ChefHat, LogOut } from 'lucide-react';
-import type { Order } from '../types';
+import type { Order, PrepBoardLine } from '../types';
 import ConfirmModal from '../components/ConfirmModal';
 
 const API_BASE = import.meta.env.VITE_API_BASE || "/api/v1";
 
+// pending → preparing → ready → completed; the card button moves one step
+const ACTIVE_STATUSES = ['pending', 'preparing', 'ready'];
+const NEXT_STATUS: Record<string, { status: string; label: string }> = {
+    pending: { status: 'preparing', label: '開始製作' },
+    preparing: { status: 'ready', label: '出餐' },
+    ready: { status: 'completed', label: '完成' },
+};
+const STATUS_LABEL: Record<string, string> = { pending: '待製作', preparing: '製作中', ready: '待取餐' };
+
+interface BulkStatusResult {
+    id: string;
+    result: 'updated' | 'conflict' | 'invalid' | 'not_found';
+    status: string | null;
+    version: number | null;
+}
+
 const Kitchen: React.FC = () => {
     const [orders, setOrders] = useState<Order[]>([]);
     const [loading, setLoading] = useState<boolean>(true);
@@ -14,17 +30,7 @@ const Kitchen: React.FC = () => {
     const [completingIds, setCompletingIds] = useState<string[]>([]);
     const [deleteId, setDeleteId] = useState<string | null>(null);
     const [storeName, setStoreName] = useState<string>("");
-
-    const fetchOrders = async () => {
-        try {
-            const res = await axios.get<Order[]>(`${API_BASE}/orders/active`);
-            setOrders(res.data);
-        } catch (err) {
-            console.error("Failed to fetch orders", err);
-        } finally {
-            setLoading(false);
-        }
-    };
+    const [prepBoard, setPrepBoard] = useState<PrepBoardLine[]>([]);
 
     useEffect(() => {
         // Get store name from token
@@ -39,8 +45,46 @@ const Kitchen: React.FC = () => {
             }
         }
 
-        fetchOrders();
-        const interval = setInterval(fetchOrders, 10000); // Poll every 10 seconds
+        // Totals to prepare per product + options; the server answers 304 while
+        // nothing changed, so refetching on every order event stays cheap
+        const refreshPrepBoard = () => {
+            axios.get<PrepBoardLine[]>(`${API_BASE}/orders/prep-board`)
+                .then(res => setPrepBoard(res.data))
+                .catch(err => console.error("Failed to load prep board", err));
+        };
+
+        // Server-pushed order stream (snapshot + deltas); EventSource reconnects
+        // by itself and resumes from the last event id it received
+        const source = new EventSource(`${API_BASE}/orders/stream?token=${encodeURIComponent(token || "")}`);
+        const removeOrder = (id: string) => setOrders(prev => prev.filter(o => o.id !== id));
+
+        source.addEventListener('snapshot', (e) => {
+            setOrders(JSON.parse((e as MessageEvent).data));
+            setLoading(false);
+            refreshPrepBoard();
+        });
+        source.addEventListener('order_created', (e) => {
+            const order: Order = JSON.parse((e as MessageEvent).data);
+            setOrders(prev => prev.some(o => o.id === order.id) ? prev : [...prev, order]);
+            refreshPrepBoard();
+        });
+        source.addEventListener('order_updated', (e) => {
+            const { id, status, version } = JSON.parse((e as MessageEvent).data);
+            if (ACTIVE_STATUSES.includes(status)) {
+                setOrders(prev => prev.map(o => o.id === id ? { ...o, status, version } : o));
+            } else {
+                removeOrder(id);
+            }
+            refreshPrepBoard();
+        });
+        source.addEventListener('order_deleted', (e) => {
+            removeOrder(JSON.parse((e as MessageEvent).data).id);
+            refreshPrepBoard();
+        });
+        source.onerror = () => {
+            console.error("Order stream disconnected, retrying");
+            setLoading(false);
+        };
 
         // Clock timer
         const timer = setInterval(() => {
@@ -51,25 +95,58 @@ const Kitchen: React.FC = () => {
         }, 1000);
 
         return () => {
-            clearInterval(interval);
+            source.close();
             clearInterval(timer);
         };
     }, []);
 
-    const handleComplete = async (id: string) => {
-        setCompletingIds(prev => [...prev, id]);
-
-        // Wait for animation
-        setTimeout(async () => {
-            try {
-                await axios.patch(`${API_BASE}/orders/${id}/status`, { status: 'completed' });
-                setOrders(prev => prev.filter(o => o.id !== id));
-            } catch (err) {
-                console.error(err);
+    const updateStatus = async (order: Order, status: string) => {
+        try {
+            // The version makes the server refuse if another screen changed the order first
+            const res = await axios.patch<Order>(`${API_BASE}/orders/${order.id}/status`, { status, version: order.version });
+            setOrders(prev => ACTIVE_STATUSES.includes(res.data.status)
+                ? prev.map(o => o.id === order.id ? res.data : o)
+                : prev.filter(o => o.id !== order.id));
+        } catch (err) {
+            console.error(err);
+            if (axios.isAxiosError(err) && err.response?.status === 409) {
+                alert("此訂單已在其他裝置更新 (Order was changed on another screen)");
+            } else {
                 alert("Failed to update order status");
-                setCompletingIds(prev => prev.filter(pid => pid !== id));
             }
-        }, 500); // 500ms animation duration
+            setCompletingIds(prev => prev.filter(pid => pid !== order.id));
+        }
+    };
+
+    const handleAdvance = (order: Order) => {
+        const next = NEXT_STATUS[order.status];
+        if (!next) return;
+        if (next.status !== 'completed') {
+            updateStatus(order, next.status);
+            return;
+        }
+        setCompletingIds(prev => [...prev, order.id]);
+        // Wait for animation
+        setTimeout(() => updateStatus(order, next.status), 500); // 500ms animation duration
+    };
+
+    // Complete every ready order in one request
+    const handleCompleteReady = async () => {
+        const ready = orders.filter(o => o.status === 'ready');
+        if (ready.length === 0) return;
+        try {
+            const res = await axios.patch<{ results: BulkStatusResult[] }>(`${API_BASE}/orders/status`, {
+                status: 'completed',
+                orders: ready.map(o => ({ id: o.id, status: o.status, version: o.version })),
+            });
+            const done = new Set(res.data.results.filter(r => r.result === 'updated').map(r => r.id));
+            setOrders(prev => prev.filter(o => !done.has(o.id)));
+            const skipped = ready.length - done.size;
+            if (skipped > 0) alert(`${skipped} 筆訂單已在其他裝置更新，未完成`);
+        } catch (err) {
+            console.error(err);
+            alert("Failed to update order status");
+        }
     };
 
     const confirmDelete = async () => {
@@ -113,6 +190,14 @@ const Kitchen: React.FC = () => {
                     <div className="bg-white px-6 py-3 rounded-xl font-black text-slate-700 shadow-sm border border-slate-200">
                         待製作: <span className="text-orange-600 text-xl">{orders.length}</span>
                     </div>
+                    {orders.some(o => o.status === 'ready') && (
+                        <button
+                            onClick={handleCompleteReady}
+                            className="px-4 py-3 bg-green-500 text-white rounded-xl shadow-md font-bold hover:bg-green-600 transition-colors"
+                        >
+                            待取餐全部完成
+                        </button>
+                    )}
                     <button
                         onClick={() => window.location.href = "/"}
                         className="px-4 py-3 bg-white text-slate-600 rounded-xl shadow-md font-bold hover:bg-slate-50 transition-colors border border-slate-200"
@@ -134,6 +219,26 @@ const Kitchen: React.FC = () => {
                 </div>
             </header>
 
+            {prepBoard.length > 0 && (
+                <div className="mb-8 bg-white rounded-2xl p-4 shadow-sm border border-slate-200">
+                    <div className="text-slate-400 font-bold text-xs uppercase tracking-wider mb-3">備料總覽 (Prep Board)</div>
+                    <div className="flex flex-wrap gap-2">
+                        {prepBoard.map(line => (
+                            <div key={`${line.product_id}|${line.options}`}
+                                className="flex items-center gap-2 bg-slate-50 px-3 py-2 rounded-xl border border-slate-100">
+                                <span className="text-orange-600 font-black text-lg">{line.quantity}x</span>
+                                <span className="font-bold text-slate-800">{line.product_name}</span>
+                                {line.options && (
+                                    <span className="text-[10px] font-bold text-orange-600 bg-orange-50 px-2 py-0.5 rounded-full border border-orange-100">
+                                        {line.options}
+                                    </span>
+                                )}
+                            </div>
+                        ))}
+                    </div>
+                </div>
+            )}
+
             {orders.length === 0 ? (
                 <div className="flex flex-col items-center justify-center h-[60vh] text-slate-400">
                     <CheckCircle2 size={64} className="mb-4 opacity-50" />
@@ -158,6 +263,9 @@ const Kitchen: React.FC = () => {
                                     <div className="text-3xl font-black text-slate-800">
                                         {order.table_number === 'Takeout' ? '外帶' : (order.table_number || "N/A")}
                                     </div>
+                                    <span className={`inline-block mt-2 text-[10px] px-2 py-0.5 rounded-full font-bold border ${order.status === 'pending' ? 'bg-slate-100 text-slate-500 border-slate-200' : order.status === 'preparing' ? 'bg-orange-100 text-orange-600 border-orange-200' : 'bg-green-100 text-green-600 border-green-200'}`}>
+                                        {STATUS_LABEL[order.status] || order.status}
+                                    </span>
                                 </div>
                                 <div className="text-right">
                                     <div className="text-slate-400 font-bold text-xs uppercase tracking-wider mb-1">時間 (Time)</div>
@@ -200,11 +308,11 @@ const Kitchen: React.FC = () => {
                                     <Trash2 size={18} /> 刪除
                                 </button>
                                 <button
-                                    onClick={() => handleComplete(order.id)}
+                                    onClick={() => handleAdvance(order)}
                                     disabled={completingIds.includes(order.id)}
                                     className="flex items-center justify-center gap-2 py-3 px-4 rounded-xl font-bold text-white bg-green-500 hover:bg-green-600 shadow-lg shadow-green-200 transition-all active:scale-95 disabled:opacity-50 disabled:active:scale-100"
                                 >
-                                    <CheckCircle2 size={18} /> 完成
+                                    <CheckCircle2 size={18} /> {NEXT_STATUS[order.status]?.label || '完成'}
                                 </button>
                             </div>
                         </div>
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { ShoppingCart, Utensils, Trash2, ChevronRight, LogOut, ArrowLeft, Store, Calculator } from 'lucide-react';
 import type { Category, Product, CartItem, ProductOption } from '../types';
@@ -7,6 +7,26 @@ import VirtualKeyboard from '../components/VirtualKeyboard';
 import SuccessModal from '../components/SuccessModal';
 
 const API_BASE = import.meta.env.VITE_API_BASE || "/api/v1";
+const OFFLINE_QUEUE_KEY = "pos_offline_orders";
+const FAILED_ORDERS_KEY = "pos_failed_orders";
+const SYNC_INTERVAL_MS = 30000;
+
+type QueuedOrder = {
+    idempotency_key: string;
+    client_created_at: string;
+    table_number: string;
+    order_type: string;
+    items: { product_id: string; quantity: number; option_ids: string[] }[];
+};
+
+// Queued orders the server rejected for good (unknown product, key reused
+// for a different order); kept for staff to review instead of being resent
+type FailedOrder = QueuedOrder & { error: string };
+
+const loadQueue = (): QueuedOrder[] => JSON.parse(localStorage.getItem(OFFLINE_QUEUE_KEY) || "[]");
+const saveQueue = (queue: QueuedOrder[]) => localStorage.setItem(OFFLINE_QUEUE_KEY, JSON.stringify(queue));
+const loadFailed = (): FailedOrder[] => JSON.parse(localStorage.getItem(FAILED_ORDERS_KEY) || "[]");
+const saveFailed = (failed: FailedOrder[]) => localStorage.setItem(FAILED_ORDERS_KEY, JSON.stringify(failed));
 
 const POS: React.FC = () => {
     const [menu, setMenu] = useState<Category[]>([]);
@@ -20,6 +40,10 @@ const POS: React.FC = () => {
     const [showSuccess, setShowSuccess] = useState<boolean>(false);
     const [isTakeout, setIsTakeout] = useState<boolean>(false);
     const [receivedAmount, setReceivedAmount] = useState<string>("");
+    // Reused when the same order is resubmitted, so a retry cannot create a duplicate
+    const idempotencyKey = useRef<string | null>(null);
+    const [pendingSync, setPendingSync] = useState<number>(loadQueue().length);
+    const [failedSync, setFailedSync] = useState<FailedOrder[]>(loadFailed());
 
     useEffect(() => {
         const fetchMenu = async () => {
@@ -35,6 +59,57 @@ const POS: React.FC = () => {
         fetchMenu();
     }, []);
 
+    useEffect(() => {
+        // Orders taken while offline are replayed through the bulk endpoint;
+        // each keeps its idempotency key, so resending a batch is safe.
+        let syncing = false;
+        const syncQueue = async () => {
+            const queue = loadQueue();
+            if (syncing || queue.length === 0 || !navigator.onLine) return;
+            syncing = true;
+            try {
+                const res = await axios.post(`${API_BASE}/orders/bulk`, { orders: queue });
+                const results: { idempotency_key: string; result: string; error?: string }[] = res.data.results;
+                // Every result is final: created / duplicate are done, and an
+                // error would come back the same on every resend
+                const errors = new Map<string, string>(
+                    results.filter(r => r.result === "error").map(r => [r.idempotency_key, r.error || "error"])
+                );
+                const done = new Set<string>(results.map(r => r.idempotency_key));
+                if (errors.size > 0) {
+                    errors.forEach((error, key) => console.error(key, error));
+                    const failed = [
+                        ...loadFailed(),
+                        ...queue.filter(o => errors.has(o.idempotency_key))
+                            .map(o => ({ ...o, error: errors.get(o.idempotency_key) as string })),
+                    ];
+                    saveFailed(failed);
+                    setFailedSync(failed);
+                }
+                // Orders queued while the request was in flight are kept
+                const remaining = loadQueue().filter(o => !done.has(o.idempotency_key));
+                saveQueue(remaining);
+                setPendingSync(remaining.length);
+            } catch (err) {
+                console.error(err);
+            } finally {
+                syncing = false;
+            }
+        };
+        syncQueue();
+        window.addEventListener('online', syncQueue);
+        const timer = setInterval(syncQueue, SYNC_INTERVAL_MS);
+        return () => {
+            window.removeEventListener('online', syncQueue);
+            clearInterval(timer);
+        };
+    }, []);
+
+    useEffect(() => {
+        // Any change to the order means a new submission
+        idempotencyKey.current = null;
+    }, [cart, tableNumber, isTakeout]);
+
     const handleProductClick = (product: Product) => {
         setSelectedProduct(product);
     };
@@ -57,14 +132,24 @@ const POS: React.FC = () => {
         setSelectedProduct(null);
     };
 
+    const resetOrder = () => {
+        setShowSuccess(true);
+        setCart([]);
+        setTableNumber(""); // Reset table number after order
+        setIsTakeout(false); // Reset to dine-in
+        setReceivedAmount(""); // Reset calculator
+        setSelectedCategory(null); // Return to category view
+    };
+
     const handleCheckout = async () => {
         if (cart.length === 0) return;
+        let orderPayload: Omit<QueuedOrder, "idempotency_key" | "client_created_at"> | null = null;
         try {
             if (!tableNumber && !isTakeout) {
                 alert("內用請輸入桌號，或選擇外帶");
                 return;
             }
-            const orderPayload = {
+            orderPayload = {
                 table_number: isTakeout ? "Takeout" : tableNumber,
                 order_type: isTakeout ? "takeout" : "dine_in",
                 items: cart.map(item => ({
@@ -73,14 +158,24 @@ const POS: React.FC = () => {
                     option_ids: item.selected_option_ids
                 }))
             };
-            await axios.post(`${API_BASE}/orders/`, orderPayload);
-            setShowSuccess(true);
-            setCart([]);
-            setTableNumber(""); // Reset table number after order
-            setIsTakeout(false); // Reset to dine-in
-            setReceivedAmount(""); // Reset calculator
-            setSelectedCategory(null); // Return to category view
+            idempotencyKey.current ??= crypto.randomUUID();
+            await axios.post(`${API_BASE}/orders/`, orderPayload, {
+                headers: { 'Idempotency-Key': idempotencyKey.current }
+            });
+            resetOrder();
         } catch (err) {
+            if (orderPayload && idempotencyKey.current && axios.isAxiosError(err) && !err.response) {
+                // No response from the server: keep the order locally and sync it later
+                const queue = [...loadQueue(), {
+                    ...orderPayload,
+                    idempotency_key: idempotencyKey.current,
+                    client_created_at: new Date().toISOString()
+                }];
+                saveQueue(queue);
+                setPendingSync(queue.length);
+                resetOrder();
+                return;
+            }
             alert("送單失敗");
             console.error(err);
         }
@@ -104,6 +199,27 @@ const POS: React.FC = () => {
                     </div>
                 </header>
                 <div className="absolute top-8 right-8 flex gap-4 z-50">
+                    {pendingSync > 0 && (
+                        <span className="px-6 py-3 bg-amber-100 rounded-xl text-amber-700 font-bold border border-amber-200 flex items-center">
+                            離線待同步 {pendingSync} 筆
+                        </span>
+                    )}
+                    {failedSync.length > 0 && (
+                        <button
+                            onClick={() => {
+                                const details = failedSync
+                                    .map(o => `${o.client_created_at} 桌號 ${o.table_number || "-"}: ${o.error}`)
+                                    .join("\n");
+                                if (confirm(`以下離線訂單無法同步，請人工處理：\n${details}\n\n已處理完畢並清除？`)) {
+                                    saveFailed([]);
+                                    setFailedSync([]);
+                                }
+                            }}
+                            className="px-6 py-3 bg-red-100 rounded-xl text-red-700 font-bold border border-red-200 flex items-center"
+                        >
+                            同步失敗 {failedSync.length} 筆
+                        </button>
+                    )}
                     <button
                         onClick={() => window.open('/kitchen', '_blank')}
                         className="px-6 py-3 bg-white rounded-xl shadow-md text-slate-600 font-bold hover:bg-slate-50 border border-slate-200 transition-colors flex items-center gap-2"
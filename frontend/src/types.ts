@@ -43,5 +43,13 @@ export interface Order {
   total_price: number;
   status: string;
   created_at: string;
+  version: number;
   items: OrderItemBackend[];
-}
\ No newline at end of file
+}
+
+export interface PrepBoardLine {
+  product_id: string;
+  product_name: string;
+  options: string;
+  quantity: number;
+}
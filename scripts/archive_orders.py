@@ -0,0 +1,68 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.models.archive import OrderArchive
+from app.crud import archive
+
+# Moves closed months of orders / order_items / order_item_options to zstd
+# Parquet files under ORDER_ARCHIVE_DIR/YYYY-MM/ and drops them from Postgres.
+# Meant for a monthly cron job:
+#
+#   python scripts/archive_orders.py                  archive every month older than ORDER_ARCHIVE_AFTER_MONTHS
+#   python scripts/archive_orders.py --dry-run        only list them
+#   python scripts/archive_orders.py --month 2025-01  archive one closed month
+#   python scripts/archive_orders.py --list           list archived months
+#
+# Sales stats and the analytics dashboard keep covering archived months.
+
+def parse_month(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected YYYY-MM, got {value!r}")
+
+def main(args):
+    db = SessionLocal()
+    try:
+        if args.list:
+            for a in db.query(OrderArchive).order_by(OrderArchive.month).all():
+                print(f"{a.month:%Y-%m}  {a.order_count:>8} orders  {a.item_count:>8} items  "
+                      f"revenue {a.revenue}  {a.path}")
+            return 0
+
+        months = [args.month] if args.month else archive.archivable_months(db, args.after_months)
+        if not months:
+            print("Nothing to archive.")
+        for month in months:
+            if args.dry_run:
+                print(f"Would archive {month:%Y-%m}")
+                continue
+            manifest = archive.archive_month(db, month, args.archive_dir)
+            if manifest:
+                print(f"Archived {month:%Y-%m}: {manifest.order_count} orders, {manifest.item_count} items "
+                      f"-> {manifest.path}")
+            else:
+                print(f"{month:%Y-%m} has no orders.")
+        return 0
+    except Exception as e:
+        print(f"Error archiving orders: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive closed months of orders to Parquet and remove them from the database")
+    parser.add_argument("--month", type=parse_month, help="Archive this month (YYYY-MM) only")
+    parser.add_argument("--after-months", type=int, default=None,
+                        help="Archive months older than this many months (default ORDER_ARCHIVE_AFTER_MONTHS)")
+    parser.add_argument("--archive-dir", default=None, help="Default ORDER_ARCHIVE_DIR")
+    parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--list", action="store_true", help="List archived months")
+    args = parser.parse_args()
+    sys.exit(main(args))
@@ -0,0 +1,77 @@
+import sys
+import os
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.product import Category, Product, ProductOption
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.crud import order as crud_order
+
+BASKET_SIZES = [1, 4, 12, 48]
+
+def seed_menu(db, n_products: int):
+    cat = Category(name="Bench", sort_order=0)
+    db.add(cat)
+    db.flush()
+
+    products = []
+    for i in range(n_products):
+        p = Product(name=f"Bench Product {i}", base_price=40.0 + i, category_id=cat.id, sort_order=i)
+        db.add(p)
+        db.flush()
+        small = ProductOption(product_id=p.id, name="小", price_delta=0.0, is_required=True)
+        large = ProductOption(product_id=p.id, name="大", price_delta=10.0, is_required=True)
+        db.add_all([small, large])
+        products.append((p, small, large))
+    db.commit()
+    return products
+
+def bench(database_url: str, rounds: int):
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    db = SessionLocal()
+    try:
+        products = seed_menu(db, max(BASKET_SIZES))
+
+        print(f"{'basket':>8} {'queries':>8} {'avg ms':>10}")
+        for size in BASKET_SIZES:
+            order_in = OrderCreate(
+                table_number="B1",
+                items=[
+                    OrderItemCreate(product_id=p.id, quantity=2, option_ids=[large.id])
+                    for p, small, large in products[:size]
+                ]
+            )
+
+            elapsed = 0.0
+            for _ in range(rounds):
+                statements.clear()
+                start = time.perf_counter()
+                crud_order.create_order(db, order_in)
+                elapsed += time.perf_counter() - start
+
+            print(f"{size:>8} {len(statements):>8} {elapsed / rounds * 1000:>10.2f}")
+    finally:
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Count queries issued by crud.order.create_order per basket size")
+    parser.add_argument("--database-url", default="sqlite://", help="Throwaway database to run against (default: in-memory SQLite)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    bench(args.database_url, args.rounds)
@@ -0,0 +1,137 @@
+import sys
+import os
+import json
+import time
+import uuid
+import asyncio
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import insert, delete
+
+from app.db.base import Base
+from app.db.session import engine, SessionLocal
+from app.core.security import get_password_hash
+from app.models.store import Store
+
+# Morning login storm: every terminal of --stores stores logs in at once.
+#
+#   cold  - first login of each store; every request runs a full pbkdf2 verify
+#   warm  - the same terminals logging in again; served by the verified-login cache
+#
+# While each phase runs, a probe keeps hitting GET / and records its latency:
+# if hashing blocked the event loop, the probe latency would track login latency.
+# 503 responses are the hashing pool's backpressure (PASSWORD_HASH_MAX_PENDING).
+
+PASSWORD = "bench-password"
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+def summarize(latencies: list, wall: float) -> dict:
+    values = sorted(v * 1000 for v in latencies)
+    return {
+        "requests": len(values),
+        "throughput_rps": round(len(values) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+    }
+
+def create_stores(n: int) -> list:
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    db = SessionLocal()
+    try:
+        password_hash = get_password_hash(PASSWORD)
+        names = [f"LOGIN-BENCH-{uuid.uuid4().hex[:8]}" for _ in range(n)]
+        db.execute(insert(Store), [{"id": uuid.uuid4(), "name": name, "password_hash": password_hash, "is_active": True}
+                                   for name in names])
+        db.commit()
+        return names
+    finally:
+        db.close()
+
+def drop_stores(names: list):
+    db = SessionLocal()
+    try:
+        db.execute(delete(Store).where(Store.name.in_(names)))
+        db.commit()
+    finally:
+        db.close()
+
+async def storm(client: httpx.AsyncClient, names: list, terminals: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, statuses = [], {}
+    done = asyncio.Event()
+    probe = []
+
+    async def login(name: str):
+        async with semaphore:
+            start = time.perf_counter()
+            r = await client.post("/api/v1/login/store", data={"username": name, "password": PASSWORD})
+            latencies.append(time.perf_counter() - start)
+            statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    async def probe_loop():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/")
+            probe.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    probe_task = asyncio.create_task(probe_loop())
+    started = time.perf_counter()
+    await asyncio.gather(*(login(name) for name in names for _ in range(terminals)))
+    wall = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return {
+        **summarize(latencies, wall),
+        "status_codes": {str(k): v for k, v in sorted(statuses.items())},
+        "event_loop_probe": summarize(probe, wall),
+    }
+
+async def main(args):
+    names = create_stores(args.stores)
+    try:
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        else:
+            from app.main import app
+            client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+        async with client:
+            cold = await storm(client, names, 1, args.concurrency)
+            warm = await storm(client, names, args.terminals, args.concurrency)
+    finally:
+        drop_stores(names)
+
+    report = {
+        "database": engine.dialect.name,
+        "target": args.base_url or "in-process",
+        "params": {"stores": args.stores, "terminals": args.terminals, "concurrency": args.concurrency},
+        "cold": cold,
+        "warm": warm,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure store login throughput under a concurrent login storm")
+    parser.add_argument("--stores", type=int, default=50)
+    parser.add_argument("--terminals", type=int, default=4, help="Repeat logins per store in the warm phase")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--base-url", help="Load a running server instead of app.main in-process")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    asyncio.run(main(args))
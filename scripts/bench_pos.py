@@ -0,0 +1,257 @@
+import sys
+import os
+import re
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import platform
+import subprocess
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from sqlalchemy import insert
+
+from app.db.base import Base
+from app.db.session import engine, SessionLocal
+from app.core.security import create_access_token, get_password_hash
+from app.models.store import Store
+from app.models.product import Product, ProductOption
+from app.models.order import Order, OrderItem, OrderItemOption
+from app.crud import rollup
+from scripts.seed_db import seed as seed_menu
+
+# Rush-hour load test for the POS API.
+#
+#   1. Seeds BENCH stores with months of completed order history on the menu
+#      from scripts/seed_db.py (skipped with --skip-seed).
+#   2. Runs a weighted mix of POS order creation, kitchen polling, menu fetches
+#      and admin dashboard loads from concurrent workers for --duration seconds.
+#   3. Prints per-scenario p50/p95/p99 latency, throughput and queries per
+#      request (from the Server-Timing header) as JSON, so runs on two commits
+#      can be diffed.
+#
+# Runs in-process against app.main over ASGI by default, using DATABASE_URL
+# (a local Postgres, or sqlite:///bench.db as a stand-in). Pass --base-url to
+# load a running server instead; it must share the same database.
+
+SCENARIOS = {
+    # name: (weight, method, path, auth)
+    "create_order": (30, "POST", "/api/v1/orders/", "store"),
+    "kitchen_poll": (40, "GET", "/api/v1/orders/active", "store"),
+    "menu": (20, "GET", "/api/v1/menu/", None),
+    "dashboard": (10, "GET", "/api/v1/analytics/dashboard", "admin"),
+}
+
+QUERIES_RE = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+def seed_history(n_stores: int, days: int, orders_per_day: int, seed: int):
+    """
+    Bulk insert n_stores BENCH stores with `days` of completed orders, then rebuild the rollups.
+    Returns the ids of the stores.
+    """
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    seed_menu()
+
+    rnd = random.Random(seed)
+    db = SessionLocal()
+    try:
+        products = db.query(Product).filter(Product.is_deleted == False).all()
+        options = {}
+        for o in db.query(ProductOption).filter(ProductOption.is_deleted == False).all():
+            options.setdefault(o.product_id, []).append(o)
+
+        run_id = uuid.uuid4().hex[:6]
+        password = get_password_hash("bench")
+        stores = [
+            Store(name=f"BENCH-{run_id}-{i}", password_hash=password)
+            for i in range(n_stores)
+        ]
+        db.add_all(stores)
+        db.commit()
+        store_ids = [s.id for s in stores]
+
+        today = (datetime.utcnow() + timedelta(hours=8)).replace(hour=0, minute=0, second=0, microsecond=0)
+        for store_id in store_ids:
+            order_rows, item_rows, option_rows = [], [], []
+            for d in range(days, 0, -1):
+                day = today - timedelta(days=d)
+                for _ in range(orders_per_day):
+                    # Lunch and dinner peaks
+                    hour = rnd.choice([11, 11, 12, 12, 12, 13, 17, 18, 18, 19, 20])
+                    order_id = uuid.uuid4()
+                    created_at = day + timedelta(hours=hour, minutes=rnd.randint(0, 59))
+                    total = 0
+                    for _ in range(rnd.randint(1, 5)):
+                        product = rnd.choice(products)
+                        item_id = uuid.uuid4()
+                        unit_price = product.base_price
+                        if product.id in options:
+                            option = rnd.choice(options[product.id])
+                            unit_price += option.price_delta
+                            option_rows.append({
+                                "id": uuid.uuid4(), "order_item_id": item_id, "order_created_at": created_at,
+                                "option_name": option.name, "price_delta": option.price_delta
+                            })
+                        quantity = rnd.randint(1, 3)
+                        item_rows.append({
+                            "id": item_id, "order_id": order_id, "order_created_at": created_at, "product_id": product.id,
+                            "product_name": product.name, "quantity": quantity, "unit_price": unit_price
+                        })
+                        total += unit_price * quantity
+                    order_rows.append({
+                        "id": order_id, "store_id": store_id, "table_number": str(rnd.randint(1, 20)),
+                        "order_type": rnd.choice(["dine_in", "takeout"]), "status": "completed",
+                        "total_price": total,
+                        "created_at": created_at
+                    })
+            db.execute(insert(Order), order_rows)
+            db.execute(insert(OrderItem), item_rows)
+            if option_rows:
+                db.execute(insert(OrderItemOption), option_rows)
+            db.commit()
+            print(f"Seeded store {store_id}: {len(order_rows)} orders, {len(item_rows)} items")
+
+        rollup.rebuild(db)
+        return store_ids
+    finally:
+        db.close()
+
+def bench_stores(n_stores: int):
+    db = SessionLocal()
+    try:
+        stores = db.query(Store).filter(Store.name.like("BENCH-%")).limit(n_stores).all()
+        return [s.id for s in stores]
+    finally:
+        db.close()
+
+def order_payload(rnd: random.Random, menu: list) -> dict:
+    items = []
+    for _ in range(rnd.randint(1, 5)):
+        product = rnd.choice(menu)
+        required = [o for o in product["options"] if o["is_required"]]
+        items.append({
+            "product_id": product["id"],
+            "quantity": rnd.randint(1, 3),
+            "option_ids": [rnd.choice(required)["id"]] if required else []
+        })
+    return {"table_number": str(rnd.randint(1, 20)), "order_type": "dine_in", "items": items}
+
+def percentile(sorted_values: list, p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+async def run_load(client: httpx.AsyncClient, store_ids: list, duration: float, concurrency: int, seed: int):
+    admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': 'admin', 'role': 'admin'})}"}
+    store_headers = [
+        {"Authorization": f"Bearer {create_access_token({'sub': str(s), 'role': 'store'})}"}
+        for s in store_ids
+    ]
+    menu = [p for c in (await client.get("/api/v1/menu/")).json() for p in c["products"]]
+    if not menu:
+        raise SystemExit("Menu is empty, run without --skip-seed first")
+
+    names = list(SCENARIOS)
+    weights = [SCENARIOS[n][0] for n in names]
+    samples = {n: [] for n in names}
+    deadline = time.perf_counter() + duration
+
+    async def worker(i: int):
+        rnd = random.Random(seed + i)
+        headers_for_store = store_headers[i % len(store_headers)]
+        while time.perf_counter() < deadline:
+            name = rnd.choices(names, weights)[0]
+            _, method, path, auth = SCENARIOS[name]
+            headers = {"admin": admin_headers, "store": headers_for_store}.get(auth, {})
+            body = order_payload(rnd, menu) if name == "create_order" else None
+
+            start = time.perf_counter()
+            r = await client.request(method, path, json=body, headers=headers)
+            elapsed = time.perf_counter() - start
+
+            m = QUERIES_RE.search(r.headers.get("server-timing", ""))
+            samples[name].append((elapsed, r.status_code < 400, int(m.group(1)) if m else None))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    results = {}
+    for name, rows in samples.items():
+        latencies = sorted(r[0] * 1000 for r in rows)
+        queries = [r[2] for r in rows if r[2] is not None]
+        results[name] = {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if not r[1]),
+            "throughput_rps": round(len(rows) / wall, 2),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+            "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        }
+    total = sum(r["requests"] for r in results.values())
+    return {"wall_seconds": round(wall, 2), "total_rps": round(total / wall, 2), "scenarios": results}
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+async def main(args):
+    if args.skip_seed:
+        store_ids = bench_stores(args.stores)
+    else:
+        store_ids = seed_history(args.stores, args.days, args.orders_per_day, args.seed)
+    if not store_ids:
+        raise SystemExit("No BENCH stores found, run without --skip-seed first")
+
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        from app.main import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30)
+
+    async with client:
+        report = await run_load(client, store_ids, args.duration, args.concurrency, args.seed)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "database": engine.dialect.name,
+        "target": args.base_url or "in-process",
+        "python": platform.python_version(),
+        "params": {
+            "stores": len(store_ids), "days": args.days, "orders_per_day": args.orders_per_day,
+            "duration": args.duration, "concurrency": args.concurrency, "seed": args.seed,
+        },
+        **report,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+        print(f"Wrote {args.output}")
+    print(output)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed a realistic dataset and load test order creation, kitchen polling, menu and dashboard")
+    parser.add_argument("--stores", type=int, default=3)
+    parser.add_argument("--days", type=int, default=90, help="Days of order history to seed per store")
+    parser.add_argument("--orders-per-day", type=int, default=150)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse BENCH stores seeded by an earlier run")
+    parser.add_argument("--base-url", help="Load a running server (e.g. http://localhost:8000) instead of app.main in-process")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+    asyncio.run(main(args))
@@ -0,0 +1,147 @@
+import sys
+import os
+import argparse
+import traceback
+import tempfile
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.product import Category, Product, ProductOption
+from app.models.store import Store
+from app.models.order import Order, OrderItem, OrderItemOption, OrderIdempotencyKey
+from app.schemas.order import OrderCreate, OfflineOrderCreate
+from app.crud import order as crud_order, prep_board, archive
+from app.db import partitions
+from app.api.v1.endpoints.sales import get_sales_stats
+
+# Behaviour checks for order flows that have regressed before. Each check runs
+# against a throwaway database and raises AssertionError on a failure.
+# Exits 1 if any check fails.
+
+CHECKS = []
+
+def check(fn):
+    CHECKS.append(fn)
+    return fn
+
+def seed(db):
+    store = Store(name="FlowCheck", password_hash="-")
+    db.add(store)
+    cat = Category(name="FlowCheck", sort_order=0)
+    db.add(cat)
+    db.flush()
+    product = Product(name="FlowCheck Product", base_price=50.0, category_id=cat.id, sort_order=0)
+    db.add(product)
+    db.flush()
+    large = ProductOption(product_id=product.id, name="大", price_delta=10.0, is_required=False)
+    db.add(large)
+    db.commit()
+    return store.id, product, large
+
+def order_body(product, large, quantity: int = 2) -> dict:
+    return {
+        "table_number": "F1",
+        "items": [{"product_id": product.id, "quantity": quantity, "option_ids": [large.id]}]
+    }
+
+@check
+def post_then_offline_sync_is_duplicate(db, store_id, product, large):
+    # The POST commits but the POS never sees the response and queues the same
+    # order under the same key; the sync must report it as a duplicate
+    key = "flowcheck-post-then-sync"
+    body = order_body(product, large)
+    created = crud_order.create_order(db, OrderCreate(**body), store_id=store_id, idempotency_key=key)
+    [result] = crud_order.create_orders_bulk(db, [
+        OfflineOrderCreate(**body, idempotency_key=key, client_created_at=datetime.now())
+    ], store_id=store_id)
+    assert result.result == "duplicate", result
+    assert result.order.id == created.id, (result.order.id, created.id)
+
+@check
+def offline_sync_after_key_expired_creates_order(db, store_id, product, large):
+    # Same as a single order: once the key has expired it no longer dedupes
+    key = "flowcheck-expired-key"
+    body = order_body(product, large)
+    sync = [OfflineOrderCreate(**body, idempotency_key=key, client_created_at=datetime.now())]
+    [first] = crud_order.create_orders_bulk(db, sync, store_id=store_id)
+    assert first.result == "created", first
+    db.execute(update(OrderIdempotencyKey)
+               .where(OrderIdempotencyKey.store_id == store_id, OrderIdempotencyKey.key == key)
+               .values(created_at=datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS + 1)))
+    db.commit()
+    [again] = crud_order.create_orders_bulk(db, sync, store_id=store_id)
+    assert again.result == "created", again
+    assert again.order.id != first.order.id
+
+@check
+def cancelled_order_not_in_sales_stats(db, store_id, product, large):
+    # Only completed orders count towards /sales/stats, like the rollups
+    def stats():
+        return get_sales_stats(start_date=None, end_date=None, store_id=None, db=db,
+                               payload={"role": "store", "sub": str(store_id)})["stats"]
+    before = stats()
+    done = crud_order.create_order(db, OrderCreate(**order_body(product, large)), store_id=store_id)
+    cancelled = crud_order.create_order(db, OrderCreate(**order_body(product, large, quantity=5)), store_id=store_id)
+    crud_order.update_order_status(db, done.id, "completed", store_id=store_id)
+    crud_order.update_order_status(db, cancelled.id, "cancelled", store_id=store_id)
+    after = stats()
+    assert after["total_orders"] == before["total_orders"] + 1, (before, after)
+    assert after["total_sales"] == before["total_sales"] + Decimal(str(done.total_price)), (before, after)
+
+def board_quantity(db, store_id, product) -> int:
+    return sum(r["quantity"] for r in prep_board.get_board(db, store_id=store_id) if r["product_id"] == product.id)
+
+@check
+def archiving_open_order_leaves_prep_board(db, store_id, product, large):
+    # A month is archived with an order still pending; its units must not stay on the board
+    month = partitions.add_months(archive.archive_cutoff(0), -3)
+    created_at = datetime.combine(month, datetime.min.time()) + timedelta(days=1)
+    order = Order(store_id=store_id, table_number="F1", status="pending", total_price=120, created_at=created_at)
+    item = OrderItem(product_id=product.id, product_name=product.name, quantity=2, unit_price=60, order_created_at=created_at)
+    item.selected_options = [OrderItemOption(option_name=large.name, price_delta=10, order_created_at=created_at)]
+    order.items = [item]
+    before = board_quantity(db, store_id, product)
+    db.add(order)
+    db.flush()
+    prep_board.apply_order(db, order)
+    db.commit()
+    assert board_quantity(db, store_id, product) == before + 2
+    with tempfile.TemporaryDirectory() as archive_dir:
+        assert archive.archive_month(db, month, archive_dir=archive_dir) is not None
+    assert board_quantity(db, store_id, product) == before, (board_quantity(db, store_id, product), before)
+
+def run(database_url: str) -> bool:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    ok = True
+    db = SessionLocal()
+    try:
+        store_id, product, large = seed(db)
+        for fn in CHECKS:
+            try:
+                fn(db, store_id, product, large)
+                print(f"ok    {fn.__name__}")
+            except Exception:
+                db.rollback()
+                ok = False
+                print(f"FAIL  {fn.__name__}")
+                traceback.print_exc()
+    finally:
+        db.close()
+        engine.dispose()
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check order flows that have regressed before")
+    parser.add_argument("--database-url", default="sqlite://", help="Throwaway database to run against (default: in-memory SQLite)")
+    args = parser.parse_args()
+    sys.exit(0 if run(args.database_url) else 1)
@@ -0,0 +1,111 @@
+import sys
+import os
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, func, text
+from app.core.config import settings
+from app.models.order import Order, OrderItem
+from app.crud.order import ACTIVE_STATUSES
+
+# EXPLAIN the hot order queries and check that Postgres can answer them from
+# the indexes added in b4d81f6a2c90. Seq scans are disabled for the check so a
+# tiny dev database still reports whether an index is usable at all.
+# Orders are partitioned by month (5c8e2f7a9d31): per-partition indexes are
+# reported as the parent index they belong to, and queries bounded on
+# created_at must be pruned to the months they cover.
+
+def plan_nodes(plan: dict, key: str) -> set:
+    found = set()
+    if key in plan:
+        found.add(plan[key])
+    for child in plan.get("Plans", []):
+        found |= plan_nodes(child, key)
+    return found
+
+def parent_indexes(conn) -> dict:
+    rows = conn.execute(text(
+        "SELECT c.relname, p.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE c.relkind = 'i'"
+    ))
+    return dict(rows.all())
+
+def explain(conn, stmt):
+    compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    result = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params)
+    plan = result.scalar()[0]["Plan"]
+    return plan_nodes(plan, "Index Name"), plan_nodes(plan, "Relation Name")
+
+def check():
+    store_id = uuid.uuid4()
+    start = datetime.now() - timedelta(days=30)
+    end = datetime.now()
+    order_created_at = datetime.now()
+
+    cases = [
+        (
+            "sales stats for one store and date range",
+            select(func.count(Order.id), func.sum(Order.total_price))
+                .where(Order.store_id == store_id, Order.created_at >= start, Order.created_at < end),
+            {"ix_orders_store_status_created", "ix_orders_store_created_id"},
+            2,
+        ),
+        (
+            "completed orders for one store and date range",
+            select(func.sum(Order.total_price))
+                .where(Order.store_id == store_id, Order.status == "completed",
+                       Order.created_at >= start, Order.created_at < end),
+            {"ix_orders_store_status_created", "ix_orders_store_created_id"},
+            2,
+        ),
+        (
+            "sales stats for all stores and date range",
+            select(func.count(Order.id)).where(Order.created_at >= start, Order.created_at < end),
+            {"ix_orders_created_at", "orders_pkey"},
+            2,
+        ),
+        (
+            "kitchen active orders",
+            select(Order.id).where(Order.status.in_(ACTIVE_STATUSES), Order.store_id == store_id)
+                .order_by(Order.created_at),
+            {"ix_orders_active"},
+            None,
+        ),
+        (
+            "items of one order",
+            select(OrderItem.id).where(OrderItem.order_id == uuid.uuid4()),
+            {"ix_order_items_order_id"},
+            None,
+        ),
+        (
+            "items of one order with its created_at",
+            select(OrderItem.id).where(OrderItem.order_id == uuid.uuid4(),
+                                       OrderItem.order_created_at == order_created_at),
+            {"ix_order_items_order_id", "order_items_pkey"},
+            1,
+        ),
+    ]
+
+    engine = create_engine(settings.DATABASE_URL)
+    failures = 0
+    with engine.connect() as conn:
+        conn.execute(text("SET enable_seqscan = off"))
+        parents = parent_indexes(conn)
+        for name, stmt, expected, max_partitions in cases:
+            indexes, relations = explain(conn, stmt)
+            used = {parents.get(i, i) for i in indexes}
+            ok = bool(used & expected)
+            note = ""
+            if max_partitions is not None and len(relations) > max_partitions:
+                ok = False
+                note = f", scans {len(relations)} partitions (expected <= {max_partitions})"
+            failures += not ok
+            print(f"{'OK  ' if ok else 'FAIL'} {name}: uses {sorted(used) or 'no index'}{note}")
+    engine.dispose()
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if check() else 0)
@@ -0,0 +1,134 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.product import Category, Product, ProductOption
+from app.schemas.order import OrderCreate, OrderItemCreate, OrderResponse, OrderStatusTransition
+from app.crud import order as crud_order
+
+# Query-count regression check for the order hot paths. Each path is run with a
+# small and a large basket / page; the number of statements must not depend on
+# either, and must stay within the budget below. Exits 1 on a regression.
+
+SMALL, LARGE = 1, 12
+
+# Statements per call:
+#   create: product IN + option IN + order, item and option inserts + prep board upsert
+#   status: locked order + items IN + options IN + UPDATE
+#           (+ prep board upsert leaving preparing, + 2 rollup upserts on completion)
+#   bulk status: UPDATE ... RETURNING for the whole batch
+#           (+ items IN + options IN + prep board upsert + 2 rollup upserts on completion)
+#   list:   orders + items IN + options IN
+#   delete (completed order): locked order + items + options + 2 rollup upserts + 3 DELETEs
+BUDGET = {
+    "create_order": 6,
+    "get_orders": 3,
+    "get_active_orders": 3,
+    "update_order_status": 4,
+    "complete_order": 7,
+    "bulk_prepare": 1,
+    "bulk_complete": 6,
+    "delete_order": 8,
+}
+
+def seed_menu(db, n_products: int):
+    cat = Category(name="QueryCheck", sort_order=0)
+    db.add(cat)
+    db.flush()
+
+    products = []
+    for i in range(n_products):
+        p = Product(name=f"QueryCheck Product {i}", base_price=40.0 + i, category_id=cat.id, sort_order=i)
+        db.add(p)
+        db.flush()
+        large = ProductOption(product_id=p.id, name="大", price_delta=10.0, is_required=True)
+        db.add(large)
+        products.append((p, large))
+    db.commit()
+    return products
+
+def check(database_url: str) -> bool:
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count(fn):
+        statements.clear()
+        result = fn()
+        # Serializing must not trigger lazy loads either
+        if isinstance(result, list):
+            [OrderResponse.model_validate(r) for r in result]
+        elif result is not None:
+            OrderResponse.model_validate(result)
+        return len(statements), result
+
+    db = SessionLocal()
+    ok = True
+    try:
+        products = seed_menu(db, LARGE)
+        counts = {name: {} for name in BUDGET}
+
+        for size in (SMALL, LARGE):
+            order_in = OrderCreate(
+                table_number="Q1",
+                items=[
+                    OrderItemCreate(product_id=p.id, quantity=2, option_ids=[large.id])
+                    for p, large in products[:size]
+                ]
+            )
+            counts["create_order"][size], first = count(lambda: crud_order.create_order(db, order_in))
+            created = [first] + [crud_order.create_order(db, order_in) for _ in range(size - 1)]
+
+            counts["get_orders"][size], _ = count(lambda: crud_order.get_orders(db, limit=size))
+            counts["get_active_orders"][size], _ = count(lambda: crud_order.get_active_orders(db))
+
+            order_id = first.id
+            counts["update_order_status"][size], _ = count(lambda: crud_order.update_order_status(db, order_id, "preparing"))
+            counts["complete_order"][size], _ = count(lambda: crud_order.update_order_status(db, order_id, "completed"))
+            counts["delete_order"][size], _ = count(lambda: crud_order.delete_order(db, order_id))
+
+            batch = [crud_order.create_order(db, order_in) for _ in range(size)]
+            prepare = [OrderStatusTransition(id=o.id, status="pending", version=1) for o in batch]
+            complete = [OrderStatusTransition(id=o.id, status="preparing", version=2) for o in batch]
+            def bulk(transitions, status):
+                results = crud_order.transition_orders(db, transitions, status)
+                assert all(r.result == "updated" for r in results), results
+            counts["bulk_prepare"][size], _ = count(lambda: bulk(prepare, "preparing"))
+            counts["bulk_complete"][size], _ = count(lambda: bulk(complete, "completed"))
+
+            for o in created[1:] + batch:
+                crud_order.delete_order(db, o.id)
+
+        print(f"{'path':>20} {'small':>6} {'large':>6} {'budget':>7}")
+        for name, by_size in counts.items():
+            small, large = by_size[SMALL], by_size[LARGE]
+            status = "ok"
+            if small != large:
+                status = "GROWS WITH SIZE"
+                ok = False
+            elif large > BUDGET[name]:
+                status = "OVER BUDGET"
+                ok = False
+            print(f"{name:>20} {small:>6} {large:>6} {BUDGET[name]:>7}  {status}")
+    finally:
+        db.close()
+        engine.dispose()
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that order create/update/list issue a constant number of queries")
+    parser.add_argument("--database-url", default="sqlite://", help="Throwaway database to run against (default: in-memory SQLite)")
+    args = parser.parse_args()
+    sys.exit(0 if check(args.database_url) else 1)
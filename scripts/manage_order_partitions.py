@@ -0,0 +1,77 @@
+import sys
+import os
+import argparse
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.db import partitions
+
+# Maintenance of the monthly orders / order_items / order_item_options partitions.
+#
+#   list                      attached months
+#   ensure [--months-ahead N] create the upcoming months (run daily from cron;
+#                             the API also runs it at startup)
+#   detach MONTH... | --before MONTH
+#                             detach months into standalone tables, e.g. to archive them
+#   drop MONTH... | --before MONTH
+#                             detach and drop months
+#
+# MONTH is YYYY-MM. Detaching and dropping are metadata operations; the sales
+# rollups keep the totals of removed months, but rebuild_sales_rollups.py
+# recomputes from the attached months only.
+
+def parse_month(value: str):
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Expected YYYY-MM, got {value!r}")
+
+def selected_months(db, args) -> list:
+    if args.before:
+        return [m for m in partitions.list_months(db) if m < args.before]
+    return args.months
+
+def main(args):
+    db = SessionLocal()
+    try:
+        if not partitions.is_partitioned(db):
+            print("orders is not partitioned on this database (Postgres after `alembic upgrade head` only).")
+            return 1
+
+        if args.command == "list":
+            for month in partitions.list_months(db):
+                print(f"{month:%Y-%m}")
+        elif args.command == "ensure":
+            created = partitions.ensure_partitions(db, args.months_ahead)
+            print(f"Created {len(created)} partitions." + (f" {', '.join(created)}" if created else ""))
+        else:
+            action = partitions.detach_month if args.command == "detach" else partitions.drop_month
+            months = selected_months(db, args)
+            if not months:
+                print("No months selected.")
+            for month in months:
+                tables = action(db, month)
+                print(f"{args.command}: {', '.join(tables)}")
+        return 0
+    except Exception as e:
+        print(f"Error managing order partitions: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create, detach or drop monthly order partitions")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List attached months")
+    ensure = sub.add_parser("ensure", help="Create partitions for the current and upcoming months")
+    ensure.add_argument("--months-ahead", type=int, default=None)
+    for name in ("detach", "drop"):
+        p = sub.add_parser(name, help=f"{name.capitalize()} whole months of orders")
+        group = p.add_mutually_exclusive_group(required=True)
+        group.add_argument("months", nargs="*", type=parse_month, default=[], metavar="MONTH")
+        group.add_argument("--before", type=parse_month, help="Every attached month before this one")
+    args = parser.parse_args()
+    sys.exit(main(args))
@@ -0,0 +1,21 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.crud import order as crud_order
+
+def purge():
+    db = SessionLocal()
+    try:
+        count = crud_order.purge_expired_idempotency_keys(db)
+        print(f"Deleted {count} expired idempotency keys.")
+    except Exception as e:
+        print(f"Error purging idempotency keys: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    purge()
@@ -0,0 +1,21 @@
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.crud import prep_board
+
+def rebuild():
+    db = SessionLocal()
+    try:
+        prep_board.rebuild(db)
+        print("Kitchen prep board rebuilt from pending and preparing orders.")
+    except Exception as e:
+        print(f"Error rebuilding prep board: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    rebuild()
@@ -0,0 +1,30 @@
+import sys
+import os
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.crud import rollup
+
+def rebuild(products_only: bool = False):
+    db = SessionLocal()
+    try:
+        if products_only:
+            rollup.rebuild_products(db)
+            db.commit()
+            print("Product leaderboard rebuilt from order items.")
+        else:
+            rollup.rebuild(db)
+            print("Sales rollups rebuilt from orders.")
+    except Exception as e:
+        print(f"Error rebuilding rollups: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute the sales rollups from the orders history")
+    parser.add_argument("--products-only", action="store_true", help="Only rebuild the per-day product leaderboard")
+    args = parser.parse_args()
+    rebuild(args.products_only)